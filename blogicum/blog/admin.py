@@ -1,8 +1,166 @@
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.text import Truncator
 
-from blog.models import Category, Location, Post, Comment
+from blog.deletion import schedule_deletion
+from blog.models import (Category, Comment, Location, OutboxMessage, Post,
+                         Tombstone, User)
+from blog.signals import bulk_updated
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
+
+def estimate_count(queryset):
+    connection = connections[queryset.db]
+    table = connection.ops.quote_name(queryset.model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class '
+                           'WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'SELECT MAX(rowid) FROM {table}')
+        else:
+            return None
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that never counts more than `count_limit` rows.
+
+    Unfiltered lists of large tables use the planner estimate on
+    PostgreSQL or the largest rowid on SQLite instead of COUNT(*).
+    """
+
+    count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset)
+            if estimate is not None and estimate > self.count_limit:
+                return estimate
+        return queryset.order_by()[:self.count_limit].count()
+
+
+def set_published(modeladmin, request, queryset, is_published):
+    updated = queryset.update(is_published=is_published)
+    bulk_updated.send(sender=queryset.model)
+    modeladmin.message_user(request, f'Обновлено записей: {updated}.')
+
+
+@admin.action(description='Опубликовать выбранные')
+def publish(modeladmin, request, queryset):
+    set_published(modeladmin, request, queryset, True)
+
+
+@admin.action(description='Снять с публикации выбранные')
+def unpublish(modeladmin, request, queryset):
+    set_published(modeladmin, request, queryset, False)
+
+
+@admin.action(description='Удалить выбранные в фоне')
+def delete_in_background(modeladmin, request, queryset):
+    for obj in queryset:
+        schedule_deletion(obj)
+    modeladmin.message_user(
+        request, 'Объекты будут удалены командой purge_deleted.')
+
+
+class SoftDeleteMixin:
+    """In SOFT_DELETE mode the delete button and the delete_selected
+    action schedule the deletion, like delete_in_background, instead of
+    running the cascade in the request.
+    """
+
+    def get_deleted_objects(self, objs, request):
+        if not settings.SOFT_DELETE:
+            return super().get_deleted_objects(objs, request)
+        # The cascade is collected by purge_deleted, not here.
+        objs = list(objs)
+        opts = self.model._meta
+        perms_needed = (set() if self.has_delete_permission(request)
+                        else {opts.verbose_name})
+        return ([str(obj) for obj in objs],
+                {opts.verbose_name_plural: len(objs)}, perms_needed, [])
+
+    def delete_model(self, request, obj):
+        if not settings.SOFT_DELETE:
+            return super().delete_model(request, obj)
+        schedule_deletion(obj)
+
+    def delete_queryset(self, request, queryset):
+        if not settings.SOFT_DELETE:
+            return super().delete_queryset(request, queryset)
+        for obj in queryset:
+            schedule_deletion(obj)
+
+
+class PublishedAdmin(admin.ModelAdmin):
+    actions = (publish, unpublish)
+    list_filter = ('is_published',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Category)
+class CategoryAdmin(PublishedAdmin):
+    list_display = ('title', 'slug', 'is_published')
+    search_fields = ('title',)
+
+
+@admin.register(Location)
+class LocationAdmin(PublishedAdmin):
+    list_display = ('name', 'is_published')
+    search_fields = ('name',)
+
+
+@admin.register(Post)
+class PostAdmin(SoftDeleteMixin, PublishedAdmin):
+    list_display = ('title', 'author', 'category', 'location', 'pub_date',
+                    'is_published')
+    list_select_related = ('author', 'category', 'location')
+    list_filter = ('is_published', 'category', 'pub_date')
+    search_fields = ('title',)
+    autocomplete_fields = ('author', 'location', 'category')
+    actions = PublishedAdmin.actions + (delete_in_background,)
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('short_text', 'post', 'author', 'created_at')
+    list_select_related = ('post', 'author')
+    raw_id_fields = ('post',)
+    autocomplete_fields = ('author',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @admin.display(description='Текст комментария')
+    def short_text(self, comment):
+        return Truncator(comment.text).chars(50)
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'user', 'post')
+    list_select_related = ('user', 'post')
+    raw_id_fields = ('user', 'post')
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'created_at', 'attempts', 'sent_at')
+    list_filter = ('sent_at',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class BlogUserAdmin(SoftDeleteMixin, UserAdmin):
+    actions = (delete_in_background,)
@@ -1,7 +1,14 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        from blog import signals  # noqa: F401
+        if settings.STRICT_TEMPLATES:
+            from blog import strict_templates
+            strict_templates.enable()
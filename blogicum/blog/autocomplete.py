@@ -0,0 +1,127 @@
+import bisect
+import threading
+
+from django.conf import settings
+
+from blog.functions import CaseFold
+from blog.models import Category, Location, User
+
+LIMIT = 10
+
+
+class PrefixIndex:
+    """Sorted in-process index of labels for case-insensitive prefix lookups.
+
+    Loaded lazily on the first lookup and kept up to date by model signals.
+    Tables larger than AUTOCOMPLETE_INDEX_SIZE are not loaded into memory,
+    lookups then go to the database as a range over the CaseFold(field)
+    index, see migration 0006.
+    """
+
+    def __init__(self, model, field, **filters):
+        self.model = model
+        self.field = field
+        self.filters = filters
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.loaded = False
+            self.fallback = False
+            self.keys = []
+            self.labels = {}
+
+    def get_queryset(self):
+        return self.model._default_manager.filter(**self.filters)
+
+    def matches(self, obj):
+        return all(getattr(obj, name) == value
+                   for name, value in self.filters.items())
+
+    def load(self):
+        size = settings.AUTOCOMPLETE_INDEX_SIZE
+        rows = list(self.get_queryset().values_list('pk', self.field)
+                    .order_by()[:size + 1])
+        self.loaded = True
+        self.fallback = len(rows) > size
+        if not self.fallback:
+            self.labels = dict(rows)
+            self.keys = sorted((label.casefold(), pk) for pk, label in rows)
+
+    def search(self, prefix, limit=LIMIT):
+        prefix = prefix.strip().casefold()
+        if not prefix:
+            return []
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            if not self.fallback:
+                start = bisect.bisect_left(self.keys, (prefix,))
+                return [
+                    (pk, self.labels[pk])
+                    for key, pk in self.keys[start:start + limit]
+                    if key.startswith(prefix)
+                ]
+        # Unlike istartswith, a range on the indexed expression is a seek.
+        return list(
+            self.get_queryset()
+            .annotate(key=CaseFold(self.field))
+            .filter(key__gte=prefix, key__lt=prefix + chr(0x10FFFF))
+            .order_by('key', 'pk')
+            .values_list('pk', self.field)[:limit])
+
+    def choices(self, limit):
+        with self.lock:
+            if not self.loaded:
+                self.load()
+            if not self.fallback:
+                return [(pk, self.labels[pk])
+                        for _, pk in self.keys[:limit]]
+        return list(self.get_queryset().order_by(CaseFold(self.field), 'pk')
+                    .values_list('pk', self.field)[:limit])
+
+    def update(self, obj):
+        with self.lock:
+            if not self.loaded or self.fallback:
+                return
+            self.remove(obj.pk)
+            if self.matches(obj):
+                label = getattr(obj, self.field)
+                self.labels[obj.pk] = label
+                bisect.insort(self.keys, (label.casefold(), obj.pk))
+
+    def delete(self, obj):
+        with self.lock:
+            self.remove(obj.pk)
+
+    def remove(self, pk):
+        label = self.labels.pop(pk, None)
+        if label is not None:
+            self.keys.pop(bisect.bisect_left(self.keys,
+                                             (label.casefold(), pk)))
+
+
+INDEXES = {
+    'users': PrefixIndex(User, 'username', is_active=True),
+    'categories': PrefixIndex(Category, 'title', is_published=True),
+    'locations': PrefixIndex(Location, 'name', is_published=True),
+}
+
+
+def get_indexes(model):
+    return [index for index in INDEXES.values()
+            if issubclass(model, index.model)]
+
+
+def get_values(obj):
+    # The fields the indexes of obj's model need to update it.
+    names = set()
+    for index in get_indexes(type(obj)):
+        names.update((index.field, *index.filters))
+    return {name: getattr(obj, name) for name in names}
+
+
+def clear():
+    for index in INDEXES.values():
+        index.clear()
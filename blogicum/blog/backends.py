@@ -0,0 +1,9 @@
+from django.contrib.auth.backends import ModelBackend
+
+from blog import users
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        user = users.get_user('pk', user_id)
+        return user if self.user_can_authenticate(user) else None
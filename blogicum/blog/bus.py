@@ -0,0 +1,126 @@
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+HANDLERS = {}
+
+
+def subscribe(topic):
+    def decorator(handler):
+        HANDLERS.setdefault(topic, []).append(handler)
+        return handler
+    return decorator
+
+
+def dispatch(topic, data):
+    for handler in HANDLERS.get(topic, ()):
+        handler(**data)
+
+
+class LocalBus:
+    """Delivers events to the handlers of this process only.
+
+    Enough for a single worker; buses for several workers subclass it and
+    broadcast the events in publish() and receive them in poll().
+    """
+
+    def publish(self, topic, **data):
+        dispatch(topic, data)
+
+    def poll(self, force=False):
+        pass
+
+
+class FileBus(LocalBus):
+    """Broadcasts events to the workers of a node through a shared file.
+
+    Events are appended as JSON lines once the transaction commits, so
+    other workers do not reload data that is not committed yet. Each
+    worker reads the lines added since its last poll, at most once every
+    `poll_interval` seconds. The file is rotated at `max_size` bytes;
+    workers that see it rotated drop all their caches, as they may have
+    missed events.
+    """
+
+    def __init__(self, path, poll_interval=0.5, max_size=1024 * 1024):
+        self.path = os.fspath(path)
+        self.poll_interval = poll_interval
+        self.max_size = max_size
+        self.token = uuid.uuid4().hex
+        self.lock = threading.Lock()
+        self.polled_at = time.monotonic()
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.inode, self.position = None, 0
+        else:
+            self.inode, self.position = stat.st_ino, stat.st_size
+
+    @property
+    def sender(self):
+        # Workers forked from one process share the token.
+        return f'{os.getpid()}:{self.token}'
+
+    def publish(self, topic, **data):
+        super().publish(topic, **data)
+        line = json.dumps({'sender': self.sender, 'topic': topic,
+                           'data': data}) + '\n'
+        transaction.on_commit(lambda: self.write(line))
+
+    def write(self, line):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT,
+                     0o644)
+        try:
+            # A single write() to a file opened with O_APPEND is not
+            # interleaved with the writes of other processes.
+            os.write(fd, line.encode())
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size > self.max_size:
+            os.replace(self.path, f'{self.path}.old')
+
+    def poll(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.polled_at < self.poll_interval:
+            return
+        with self.lock:
+            self.polled_at = now
+            try:
+                with open(self.path, 'rb') as f:
+                    inode = os.fstat(f.fileno()).st_ino
+                    if self.inode is None:
+                        self.inode = inode
+                    if inode != self.inode:
+                        self.inode, self.position = inode, 0
+                        dispatch('reset', {})
+                    f.seek(self.position)
+                    chunk = f.read()
+            except FileNotFoundError:
+                return
+            # A line still being written is read on the next poll.
+            chunk = chunk[:chunk.rfind(b'\n') + 1]
+            self.position += len(chunk)
+            sender = self.sender
+            for line in chunk.splitlines():
+                event = json.loads(line)
+                if event['sender'] != sender:
+                    dispatch(event['topic'], event['data'])
+
+
+@functools.lru_cache(maxsize=None)
+def get_bus():
+    options = settings.INVALIDATION_BUS
+    return import_string(options['BACKEND'])(**options.get('OPTIONS', {}))
+
+
+def publish(topic, **data):
+    get_bus().publish(topic, **data)
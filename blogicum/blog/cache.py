@@ -0,0 +1,300 @@
+import glob
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+from django.core.cache.backends.locmem import LocMemCache
+
+
+class CappedLocMemCache(LocMemCache):
+    """LocMemCache that keeps no entry longer than its TIMEOUT, whatever
+    timeout the caller asks for.
+
+    The cache lives in one process, so the cap bounds how long a change
+    made by another worker stays unnoticed here.
+    """
+
+    def get_backend_timeout(self, timeout=DEFAULT_TIMEOUT):
+        if (timeout is DEFAULT_TIMEOUT or timeout is None
+                or timeout > self.default_timeout):
+            timeout = self.default_timeout
+        return super().get_backend_timeout(timeout)
+
+
+class AtomicFileBasedCache(FileBasedCache):
+    """FileBasedCache whose add() and incr() are atomic across processes,
+    so that workers sharing the cache directory can take locks and count
+    in it.
+
+    add() writes the entry to a temporary file and hard-links it into
+    place; the link fails if another process has added the key first.
+    incr(), decr() and touch() hold an exclusive lock on a file in the
+    cache directory while they read and rewrite the entry.
+
+    Keys starting with one of OPTIONS['PINNED_PREFIXES'] (locks, counters,
+    version stamps) are kept in a subdirectory that culling never touches
+    and that does not count towards MAX_ENTRIES; their expired files are
+    removed whenever the rest of the cache is culled.
+    """
+
+    lock_name = 'counters.lock'
+    pinned_dir = 'pinned'
+
+    def __init__(self, dir, params):
+        self.pinned_prefixes = tuple(
+            params.get('OPTIONS', {}).get('PINNED_PREFIXES', ()))
+        super().__init__(dir, params)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._createdir()
+        fname = self._key_to_file(key, version)
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, 'wb') as f:
+                self._write_content(f, timeout, value)
+            for _ in range(2):
+                try:
+                    os.link(tmp_path, fname)
+                    return True
+                except FileExistsError:
+                    if not self._has_expired(fname):
+                        return False
+        finally:
+            os.remove(tmp_path)
+        return False
+
+    def incr(self, key, delta=1, version=None):
+        fname = self._key_to_file(key, version)
+        with self._locked():
+            try:
+                with open(fname, 'rb') as f:
+                    expiry = pickle.load(f)
+                    if expiry is not None and expiry < time.time():
+                        raise FileNotFoundError
+                    value = pickle.loads(zlib.decompress(f.read())) + delta
+            except FileNotFoundError:
+                raise ValueError(f"Key '{key}' not found")
+            fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+            with open(fd, 'wb') as f:
+                # The entry keeps its expiry, unlike BaseCache.incr().
+                f.write(pickle.dumps(expiry, self.pickle_protocol))
+                f.write(zlib.compress(
+                    pickle.dumps(value, self.pickle_protocol)))
+            os.replace(tmp_path, fname)
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._locked():
+            return super().touch(key, timeout, version)
+
+    def clear(self):
+        super().clear()
+        for fname in self._list_pinned_files():
+            self._delete(fname)
+
+    def _key_to_file(self, key, version=None):
+        fname = super()._key_to_file(key, version)
+        if key.startswith(self.pinned_prefixes):
+            return os.path.join(self._dir, self.pinned_dir,
+                                os.path.basename(fname))
+        return fname
+
+    def _createdir(self):
+        super()._createdir()
+        os.makedirs(os.path.join(self._dir, self.pinned_dir), 0o700,
+                    exist_ok=True)
+
+    def _list_pinned_files(self):
+        return glob.glob(os.path.join(self._dir, self.pinned_dir,
+                                      '*' + self.cache_suffix))
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        if len(filelist) < self._max_entries:
+            return
+        for fname in self._list_pinned_files():
+            self._has_expired(fname)
+        if self._cull_frequency == 0:
+            return super().clear()
+        for fname in random.sample(
+                filelist, int(len(filelist) / self._cull_frequency)):
+            self._delete(fname)
+
+    @contextmanager
+    def _locked(self):
+        self._createdir()
+        with open(os.path.join(self._dir, self.lock_name), 'ab') as f:
+            locks.lock(f, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(f)
+
+    def _has_expired(self, fname):
+        # _is_expired() removes the expired file, so the next link wins.
+        try:
+            with open(fname, 'rb') as f:
+                return self._is_expired(f)
+        except FileNotFoundError:
+            return True
+
+
+class LRUCache:
+    """Thread-safe in-process cache of at most `maxsize` entries.
+
+    Each entry lives for `ttl` seconds.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                expires, value = self.data[key]
+            except KeyError:
+                return default
+            if expires < time.monotonic():
+                del self.data[key]
+                return default
+            self.data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        if ttl is None or ttl > self.ttl:
+            ttl = self.ttl
+        with self.lock:
+            self.data[key] = (time.monotonic() + ttl, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.data.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+
+MISSING = object()
+# Local tiers are shared by the threads of a process, like LocMemCache.
+_local_tiers = {}
+
+
+class TwoTierCache(BaseCache):
+    """Per-process LRU of at most MAX_ENTRIES entries, each kept for at
+    most LOCAL_TIMEOUT seconds, in front of the SHARED cache alias.
+
+    Writes go through to both tiers; add(), incr() and the like only to
+    the shared one, so that locks and counters stay atomic. Keys starting
+    with one of SHARED_PREFIXES skip the local tier: these are the version
+    stamps that cached values are checked against (see blog.feeds), so a
+    write in one worker invalidates the local copies of all the others.
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.shared_prefixes = tuple(options.get('SHARED_PREFIXES', ()))
+        self.local = _local_tiers.setdefault(location, LRUCache(
+            self._max_entries, options.get('LOCAL_TIMEOUT', 60)))
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def is_local(self, key):
+        return not key.startswith(self.shared_prefixes)
+
+    def set_local(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if self.is_local(key) and (timeout is None or timeout > 0):
+            self.local.set(self.make_key(key, version),
+                           pickle.dumps(value, pickle.HIGHEST_PROTOCOL),
+                           timeout)
+
+    def evict_local(self, *keys, version=None):
+        self.local.delete(*(self.make_key(key, version) for key in keys))
+
+    def clear_local(self):
+        self.local.clear()
+
+    def get(self, key, default=None, version=None):
+        if self.is_local(key):
+            pickled = self.local.get(self.make_key(key, version), MISSING)
+            if pickled is not MISSING:
+                return pickle.loads(pickled)
+        value = self.shared.get(key, MISSING, version)
+        if value is MISSING:
+            return default
+        self.set_local(key, value, version=version)
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        for key in keys:
+            if self.is_local(key):
+                pickled = self.local.get(self.make_key(key, version), MISSING)
+                if pickled is not MISSING:
+                    found[key] = pickle.loads(pickled)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            shared = self.shared.get_many(missing, version)
+            for key, value in shared.items():
+                self.set_local(key, value, version=version)
+            found.update(shared)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version)
+        self.set_local(key, value, timeout, version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version)
+        for key, value in data.items():
+            self.set_local(key, value, timeout, version)
+        return failed
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.evict_local(key, version=version)
+        return self.shared.add(key, value, timeout, version)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        self.evict_local(key, version=version)
+        return self.shared.incr(key, delta, version)
+
+    def has_key(self, key, version=None):
+        return self.shared.has_key(key, version)  # noqa: W601
+
+    def delete(self, key, version=None):
+        self.evict_local(key, version=version)
+        return self.shared.delete(key, version)
+
+    def delete_many(self, keys, version=None):
+        self.evict_local(*keys, version=version)
+        self.shared.delete_many(keys, version)
+
+    def clear(self):
+        self.clear_local()
+        self.shared.clear()
@@ -0,0 +1,40 @@
+import copy
+
+from django.conf import settings
+
+from blog.cache import LRUCache
+from blog.models import Category, Location
+
+FIELDS = {Category: ('pk', 'slug'), Location: ('pk',)}
+CACHE = LRUCache(len(FIELDS), settings.CATALOG_CACHE_TIMEOUT)
+
+
+def get_published(model, field='pk'):
+    """Published objects of `model` by `field`, loaded with one query.
+
+    Dropped on every worker through the invalidation bus and kept at
+    most CATALOG_CACHE_TIMEOUT seconds in case an event is missed.
+    """
+    maps = CACHE.get(model)
+    if maps is None:
+        objects = list(model._default_manager.filter(is_published=True))
+        maps = {name: {getattr(obj, name): obj for obj in objects}
+                for name in FIELDS[model]}
+        CACHE.set(model, maps)
+    return maps[field]
+
+
+def get_category(slug):
+    return copy.copy(get_published(Category, 'slug').get(slug))
+
+
+def get_location(pk):
+    return copy.copy(get_published(Location).get(pk))
+
+
+def forget(model):
+    CACHE.delete(model)
+
+
+def clear():
+    CACHE.clear()
@@ -0,0 +1,90 @@
+from http.cookies import SimpleCookie
+from importlib import import_module
+from io import BytesIO
+from urllib.parse import urlencode, urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth import login
+from django.core.handlers.wsgi import WSGIHandler
+from django.http import HttpRequest
+
+
+class WSGIResponse:
+    def __init__(self, status, headers, content):
+        self.status_code = int(status.split(' ', 1)[0])
+        self.headers = headers
+        self.content = content
+
+    def get_header(self, name):
+        for key, value in self.headers:
+            if key.lower() == name.lower():
+                return value
+        return None
+
+
+class WSGIClient:
+    """Sends requests through the real WSGI handler without a server."""
+
+    def __init__(self, handler=None, host='localhost'):
+        self.handler = handler or WSGIHandler()
+        self.host = host
+        self.cookies = SimpleCookie()
+
+    def login(self, user):
+        engine = import_module(settings.SESSION_ENGINE)
+        request = HttpRequest()
+        request.session = engine.SessionStore()
+        login(request, user, settings.AUTHENTICATION_BACKENDS[0])
+        request.session.save()
+        self.cookies[settings.SESSION_COOKIE_NAME] = (
+            request.session.session_key)
+
+    def get(self, url, **headers):
+        return self.request('GET', url, **headers)
+
+    def post(self, url, data=None, **headers):
+        data = dict(data or {})
+        token = self.cookies.get(settings.CSRF_COOKIE_NAME)
+        if token is not None:
+            data.setdefault('csrfmiddlewaretoken', token.value)
+        body = urlencode(data).encode()
+        return self.request('POST', url, body, **headers)
+
+    def request(self, method, url, body=b'', **headers):
+        parts = urlsplit(url)
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'HTTP_HOST': self.host,
+            'SERVER_NAME': self.host,
+            'REMOTE_ADDR': '127.0.0.1',
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+        }
+        if self.cookies:
+            environ['HTTP_COOKIE'] = '; '.join(
+                f'{key}={morsel.value}'
+                for key, morsel in self.cookies.items()
+            )
+        environ.update(headers)
+        setup_testing_defaults(environ)
+
+        started = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            started['status'] = status
+            started['headers'] = response_headers
+
+        result = self.handler(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        for key, value in started['headers']:
+            if key.lower() == 'set-cookie':
+                self.cookies.load(value)
+        return WSGIResponse(started['status'], started['headers'], content)
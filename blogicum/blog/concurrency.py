@@ -0,0 +1,94 @@
+import functools
+import threading
+
+from django.conf import settings
+from django.urls import reverse
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def classify(request):
+    # The metrics are needed most while the limits are hit: not limited.
+    if request.path == reverse('blog:concurrency_metrics'):
+        return None
+    # An unset MEDIA_URL reads as '/', which is no media prefix.
+    prefixes = tuple(url for url in (settings.MEDIA_URL, settings.STATIC_URL)
+                     if url.strip('/'))
+    if prefixes and request.path.startswith(prefixes):
+        return 'media'
+    if request.method not in SAFE_METHODS:
+        return 'writes'
+    return 'feeds'
+
+
+class ConcurrencyLimiter:
+    """Caps the requests a worker serves at once, in total and per class.
+
+    At most `queue_size` requests wait for a slot, each for at most
+    `timeout` seconds; the rest are turned away at once.
+    """
+
+    def __init__(self, total, limits, queue_size, timeout):
+        self.total = total
+        self.limits = dict(limits)
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.condition = threading.Condition()
+        self.stats = {name: dict.fromkeys(
+            ('in_flight', 'waiting', 'served', 'rejected', 'stale'), 0)
+            for name in self.limits}
+
+    def in_flight(self):
+        return sum(stats['in_flight'] for stats in self.stats.values())
+
+    def has_slot(self, name):
+        return (self.stats[name]['in_flight'] < self.limits[name]
+                and self.in_flight() < self.total)
+
+    def acquire(self, name, wait=True):
+        stats = self.stats[name]
+        with self.condition:
+            if not self.has_slot(name):
+                waiting = sum(stats['waiting']
+                              for stats in self.stats.values())
+                if not wait or waiting >= self.queue_size:
+                    return False
+                stats['waiting'] += 1
+                try:
+                    entered = self.condition.wait_for(
+                        lambda: self.has_slot(name), self.timeout)
+                finally:
+                    stats['waiting'] -= 1
+                if not entered:
+                    return False
+            stats['in_flight'] += 1
+            stats['served'] += 1
+            return True
+
+    def release(self, name):
+        with self.condition:
+            self.stats[name]['in_flight'] -= 1
+            self.condition.notify_all()
+
+    def count(self, name, outcome):
+        with self.condition:
+            self.stats[name][outcome] += 1
+
+    def snapshot(self):
+        with self.condition:
+            return {
+                'limit': self.total,
+                'in_flight': self.in_flight(),
+                'classes': {
+                    name: {'limit': self.limits[name], **stats}
+                    for name, stats in self.stats.items()
+                },
+            }
+
+
+@functools.lru_cache(maxsize=None)
+def get_limiter():
+    return ConcurrencyLimiter(settings.CONCURRENCY_LIMIT,
+                              settings.CONCURRENCY_LIMITS,
+                              settings.CONCURRENCY_QUEUE_SIZE,
+                              settings.CONCURRENCY_QUEUE_TIMEOUT)
@@ -0,0 +1,76 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from blog.models import Comment, Post, Tombstone, User
+
+BATCH_SIZE = 500
+
+
+def exclude_deleted(queryset, *relations):
+    # In soft-delete mode objects with a tombstone are hidden until the
+    # purge_deleted command removes them.
+    if not settings.SOFT_DELETE:
+        return queryset
+    return queryset.filter(
+        **{f'{relation}__isnull': True for relation in relations})
+
+
+def schedule_deletion(obj):
+    if isinstance(obj, Post):
+        Tombstone.objects.get_or_create(post=obj)
+        return
+    Tombstone.objects.get_or_create(user=obj)
+    obj.is_active = False
+    obj.save(update_fields=('is_active',))
+
+
+def delete_in_batches(queryset, batch_size=BATCH_SIZE, pause=0):
+    deleted = 0
+    while True:
+        pks = list(queryset.order_by().values_list('pk', flat=True)
+                   [:batch_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            queryset.model.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+        time.sleep(pause)
+
+
+def purge_posts(posts, batch_size=BATCH_SIZE, pause=0):
+    storage = Post._meta.get_field('image').storage
+    deleted = 0
+    while True:
+        batch = list(posts.order_by().values_list('pk', 'image')
+                     [:batch_size])
+        if not batch:
+            return deleted
+        pks = [pk for pk, _ in batch]
+        delete_in_batches(Comment.objects.filter(post__in=pks),
+                          batch_size, pause)
+        with transaction.atomic():
+            Post.objects.filter(pk__in=pks).delete()
+        for _, image in batch:
+            if image:
+                storage.delete(image)
+        deleted += len(pks)
+        time.sleep(pause)
+
+
+def purge(tombstone, batch_size=BATCH_SIZE, pause=0):
+    """Deletes the object of the tombstone and everything that depends on
+    it in transactions of at most `batch_size` rows.
+
+    The tombstone itself goes away with its object.
+    """
+    if tombstone.post_id is not None:
+        purge_posts(Post.objects.filter(pk=tombstone.post_id),
+                    batch_size, pause)
+        return
+    delete_in_batches(Comment.objects.filter(author=tombstone.user_id),
+                      batch_size, pause)
+    purge_posts(Post.objects.filter(author=tombstone.user_id),
+                batch_size, pause)
+    User.objects.filter(pk=tombstone.user_id).delete()
@@ -0,0 +1,51 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+CHUNK_SIZE = 2000
+POST_FIELDS = ('id', 'title', 'text', 'pub_date', 'is_published',
+               'created_at', 'author__username', 'category__slug',
+               'location__name')
+COMMENT_FIELDS = ('id', 'post_id', 'author__username', 'text', 'created_at')
+COLUMNS = {'author__username': 'author', 'category__slug': 'category',
+           'location__name': 'location'}
+CSV_HEADER = ('type', 'id', 'post_id', 'title', 'text', 'pub_date',
+              'is_published', 'created_at', 'author', 'category', 'location')
+
+
+def iter_rows(posts, comments, chunk_size=CHUNK_SIZE):
+    for kind, queryset, fields in (('post', posts, POST_FIELDS),
+                                   ('comment', comments, COMMENT_FIELDS)):
+        rows = queryset.order_by('pk').values(*fields)
+        for row in rows.iterator(chunk_size=chunk_size):
+            yield {'type': kind, **{COLUMNS.get(key, key): value
+                                    for key, value in row.items()}}
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    writer = csv.DictWriter(Echo(), CSV_HEADER)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+FORMATS = {
+    'jsonl': (iter_jsonl, 'application/x-ndjson'),
+    'csv': (iter_csv, 'text/csv'),
+}
+
+
+def export(posts, comments, export_format, chunk_size=CHUNK_SIZE):
+    serialize, _ = FORMATS[export_format]
+    return serialize(iter_rows(posts, comments, chunk_size))
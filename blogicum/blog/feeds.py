@@ -0,0 +1,191 @@
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+SITE_SCOPE = 'site'
+# A recomputation holds the key's lock for at most LOCK_TIMEOUT seconds;
+# readers without a value to serve wait up to WAIT_TIMEOUT for it.
+LOCK_TIMEOUT = 10
+WAIT_TIMEOUT = 2
+POLL_INTERVAL = 0.05
+# XFetch: larger values refresh earlier before the entry expires.
+EARLY_REFRESH_BETA = 1.0
+
+
+def version_key(scope):
+    return f'feed:version:{scope}'
+
+
+def new_version():
+    return uuid.uuid4().hex[:12]
+
+
+def version_timeout():
+    # Entries live at most 2 * FEED_CACHE_TIMEOUT (see store()), so an
+    # older stamp is not needed; a missing one only means a miss.
+    return 2 * settings.FEED_CACHE_TIMEOUT
+
+
+def get_versions(scopes):
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, version_timeout())
+        versions.update(missing)
+    return tuple(versions[key] for key in keys)
+
+
+def bump(*scopes):
+    cache.set_many({version_key(scope): new_version() for scope in scopes},
+                   version_timeout())
+
+
+def get_post_scopes(post_id, category_id, author_id):
+    return ('posts', f'post:{post_id}', f'category:{category_id}',
+            f'author:{author_id}')
+
+
+def next_publication(now):
+    return Post.objects.filter(pub_date__gt=now).aggregate(
+        Min('pub_date'))['pub_date__min']
+
+
+def add_comment_counts(posts):
+    counts = dict(
+        Comment.objects.filter(post__in=posts).order_by().values('post')
+        .annotate(count=Count('pk')).values_list('post', 'count'))
+    for post in posts:
+        post.comment_count = counts.get(post.pk, 0)
+    return posts
+
+
+def is_fresh(envelope, versions, now):
+    return (envelope['versions'] == versions
+            and now.timestamp() < envelope['expires']
+            and (envelope['until'] is None or now < envelope['until']))
+
+
+def refresh_early(envelope, now):
+    # Probabilistic early expiration (XFetch): the closer the expiry and
+    # the longer the computation, the likelier a reader recomputes ahead
+    # of time, so that a hot entry does not expire for everyone at once.
+    return (now.timestamp() - envelope['delta'] * EARLY_REFRESH_BETA
+            * math.log(random.random() or 1e-12) >= envelope['expires'])
+
+
+def store(key, versions, compute, timeout):
+    started = time.monotonic()
+    value, until = compute()
+    delta = time.monotonic() - started
+    # The entry outlives its freshness by `timeout`, so that stale values
+    # can be served while another worker recomputes them.
+    cache.set(key, {'versions': versions, 'until': until,
+                    'expires': time.time() + timeout, 'delta': delta,
+                    'value': value}, 2 * timeout)
+    return value
+
+
+def wait_for(key, versions):
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        envelope = cache.get(key)
+        if envelope is not None and is_fresh(envelope, versions,
+                                             timezone.now()):
+            return envelope
+        if cache.get(f'lock:{key}') is None:
+            return None
+    return None
+
+
+def fetch(key, versions, compute, timeout=None):
+    """Returns the cached value of `key` for the scope `versions`.
+
+    `compute` returns the value and the time it goes stale (or None).
+    Only the worker holding the key's lock recomputes a stale or missing
+    value: the others serve the stale value if there is one and wait for
+    the new one otherwise.
+    """
+    if timeout is None:
+        timeout = settings.FEED_CACHE_TIMEOUT
+    envelope = cache.get(key)
+    now = timezone.now()
+    if (envelope is not None and not is_fresh(envelope, versions, now)
+            and hasattr(cache, 'evict_local')):
+        # Another worker may have stored a fresh value in the shared tier.
+        cache.evict_local(key)
+        envelope = cache.get(key)
+    if (envelope is not None and is_fresh(envelope, versions, now)
+            and not refresh_early(envelope, now)):
+        return envelope['value']
+    lock = f'lock:{key}'
+    if cache.add(lock, 1, LOCK_TIMEOUT):
+        try:
+            return store(key, versions, compute, timeout)
+        finally:
+            cache.delete(lock)
+    if envelope is not None:
+        return envelope['value']
+    envelope = wait_for(key, versions)
+    if envelope is not None:
+        return envelope['value']
+    # The lock holder is too slow or gone; compute without the lock.
+    return store(key, versions, compute, timeout)
+
+
+def cached(key, scopes, compute):
+    return fetch(f'feed:{key}', get_versions((*scopes, SITE_SCOPE)),
+                 lambda: (compute(), None))
+
+
+class CachedFeed:
+    """Feed queryset for Paginator with the count and pages cached.
+
+    Cache entries are envelopes with the versions of the feed's scopes
+    and the time of the next scheduled publication. Writes bump the
+    versions they affect (see blog.signals), so the entry goes stale
+    exactly when its result may change; `timezone.now()` plays no part
+    in the key. Comment counts are fetched for the page on every request,
+    so comments, the most frequent write, do not invalidate feeds.
+    """
+
+    def __init__(self, queryset, key, scopes):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.key = key
+        self.scopes = (*scopes, SITE_SCOPE)
+        self.versions = None
+        self.until = None
+
+    def get(self, part, compute):
+        if self.versions is None:
+            self.versions = get_versions(self.scopes)
+        return fetch(f'feed:{self.key}:{part}', self.versions,
+                     lambda: (compute(), self.get_until()))
+
+    def get_until(self):
+        if self.until is None:
+            self.until = (next_publication(timezone.now()),)
+        return self.until[0]
+
+    def count(self):
+        return self.get('count', self.queryset.count)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        posts = self.get(f'{index.start}:{index.stop}',
+                         lambda: list(self.queryset[index]))
+        return add_comment_counts(posts)
@@ -1,7 +1,12 @@
 from django import forms
 from django.forms import ModelForm
+from django.contrib.auth.forms import PasswordResetForm
 from django.contrib.auth.models import User
+from django.core.mail import EmailMultiAlternatives
+from django.template import loader
+from blog import outbox
 from blog.models import Post, Comment
+from blog.widgets import AutocompleteSelect
 
 
 class PostForm(ModelForm):
@@ -13,7 +18,9 @@ class PostForm(ModelForm):
         fields = ('title', 'text', 'pub_date', 'is_published',
                   'location', 'category', 'image')
         widgets = {'pub_date':
-                   forms.DateInput(attrs={'type': 'date'})}
+                   forms.DateInput(attrs={'type': 'date'}),
+                   'location': AutocompleteSelect('locations'),
+                   'category': AutocompleteSelect('categories')}
 
 
 class CommentForm(ModelForm):
@@ -36,3 +43,19 @@ class UserUpdateForm(ModelForm):
         if obj.exists():
             raise forms.ValidationError('Уже есть пользователь с таким email.')
         return email
+
+
+class OutboxPasswordResetForm(PasswordResetForm):
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = loader.render_to_string(subject_template_name, context)
+        subject = ''.join(subject.splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        message = EmailMultiAlternatives(subject, body, from_email,
+                                         [to_email])
+        if html_email_template_name is not None:
+            message.attach_alternative(
+                loader.render_to_string(html_email_template_name, context),
+                'text/html')
+        outbox.enqueue(message)
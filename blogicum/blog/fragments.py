@@ -0,0 +1,34 @@
+from django.utils.cache import patch_vary_headers
+
+# Clients ask for the bare list of post cards with this Accept type or
+# with X-Requested-With: XMLHttpRequest.
+FRAGMENT_MEDIA_TYPE = 'text/vnd.blogicum.fragment+html'
+
+
+def is_fragment_request(request):
+    return (FRAGMENT_MEDIA_TYPE in request.headers.get('Accept', '')
+            or request.headers.get('X-Requested-With') == 'XMLHttpRequest')
+
+
+class FragmentMixin:
+    """Renders only the post cards of page_obj for fragment requests, for
+    infinite scrolling.
+
+    X-Next-Cursor holds the number of the next page, absent on the last.
+    """
+
+    fragment_template_name = 'includes/post_list.html'
+
+    def render_to_response(self, context, **response_kwargs):
+        if is_fragment_request(self.request):
+            response = self.response_class(
+                request=self.request, template=self.fragment_template_name,
+                context=context, using=self.template_engine,
+                **response_kwargs)
+            page = context['page_obj']
+            if page.has_next():
+                response['X-Next-Cursor'] = page.next_page_number()
+        else:
+            response = super().render_to_response(context, **response_kwargs)
+        patch_vary_headers(response, ('Accept', 'X-Requested-With'))
+        return response
@@ -0,0 +1,29 @@
+from django.db.backends.signals import connection_created
+from django.db.models import Func
+from django.dispatch import receiver
+
+
+class CaseFold(Func):
+    """Folds case in the database the way str.casefold() does in Python.
+
+    SQLite's LOWER() folds ASCII only, so there it calls the CASEFOLD
+    function registered on every connection; other databases use LOWER().
+    """
+
+    function = 'LOWER'
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function='CASEFOLD',
+                              **extra_context)
+
+
+def casefold(value):
+    return None if value is None else value.casefold()
+
+
+@receiver(connection_created)
+def register_casefold(sender, connection, **kwargs):
+    # Deterministic functions may be used in index expressions.
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function('CASEFOLD', 1, casefold,
+                                              deterministic=True)
@@ -0,0 +1,192 @@
+import json
+import os
+from collections import Counter
+
+from django.apps import apps
+from django.core.serializers import python
+from django.db import connection, transaction
+
+from blog import bus, feeds, search
+from blog.seeding import reset_sequences
+
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 2000
+MODEL_ORDER = ('auth.user', 'blog.category', 'blog.location', 'blog.post',
+               'blog.comment')
+
+
+class DumpError(Exception):
+    pass
+
+
+def iter_json_array(file, buffer, chunk_size=CHUNK_SIZE):
+    decoder = json.JSONDecoder()
+    buffer = buffer.lstrip()[1:]
+    eof = False
+    while True:
+        buffer = buffer.lstrip().lstrip(',').lstrip()
+        if buffer.startswith(']'):
+            return
+        try:
+            record, end = decoder.raw_decode(buffer)
+        except json.JSONDecodeError:
+            if eof:
+                raise DumpError('Дамп обрывается на середине объекта.')
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+            continue
+        yield record
+        buffer = buffer[end:]
+
+
+def iter_jsonl(file, buffer, chunk_size=CHUNK_SIZE):
+    while True:
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+    if buffer.strip():
+        yield json.loads(buffer)
+
+
+def iter_records(file, chunk_size=CHUNK_SIZE):
+    """Yields dump records one by one, keeping at most a chunk in memory."""
+    buffer = file.read(chunk_size)
+    if buffer.lstrip().startswith('['):
+        return iter_json_array(file, buffer, chunk_size)
+    return iter_jsonl(file, buffer, chunk_size)
+
+
+def deserialize(record):
+    return next(python.Deserializer([record], ignorenonexistent=True))
+
+
+def check_references(model, objects):
+    for field in model._meta.concrete_fields:
+        if not field.many_to_one:
+            continue
+        ids = {getattr(obj, field.attname) for obj in objects}
+        ids.discard(None)
+        found = set(field.related_model._base_manager.filter(
+            pk__in=ids).values_list('pk', flat=True))
+        missing = ids - found
+        if missing:
+            raise DumpError(
+                f'{model._meta.label_lower}: `{field.name}` ссылается на '
+                f'отсутствующие объекты {sorted(missing)[:10]}.')
+
+
+def insert(model, objects, ignore_conflicts=False):
+    # Raw inserts keep auto_now_add values from the dump, like loaddata.
+    fields = model._meta.concrete_fields
+    size = max(connection.ops.bulk_batch_size(fields, objects), 1)
+    for start in range(0, len(objects), size):
+        model._base_manager._insert(
+            objects[start:start + size], fields=fields, raw=True,
+            ignore_conflicts=ignore_conflicts)
+
+
+def insert_m2m(model, m2m_rows):
+    for field_name, rows in m2m_rows.items():
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        through._base_manager.bulk_create([
+            through(**{f'{field.m2m_field_name()}_id': pk,
+                       f'{field.m2m_reverse_field_name()}_id': related_pk})
+            for pk, related_pk in rows
+        ], ignore_conflicts=True)
+
+
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding='utf-8') as file:
+            return json.load(file)['records']
+
+    def save(self, records):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({'records': records}, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class DumpImporter:
+    def __init__(self, checkpoint, batch_size=BATCH_SIZE, resume=False):
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.skip = checkpoint.load() if resume else 0
+        self.ignore_conflicts = resume
+        self.imported = Counter()
+        self.skipped = Counter()
+        self.models = set()
+        self.present = set()
+
+    def run(self, path):
+        """Loads the dump at `path`, reading it once per model in MODEL_ORDER.
+
+        Each pass inserts a single model, so the dump may list models in
+        any order, as dumpdata does, while only one batch is kept in
+        memory. Positions in the checkpoint count records in pass order.
+        """
+        position, self.present = 0, {MODEL_ORDER[0]}
+        for label in MODEL_ORDER:
+            if label not in self.present:
+                continue
+            model, batch, m2m_rows = apps.get_model(label), [], {}
+            for record in self.read(path, label):
+                position += 1
+                if position <= self.skip:
+                    continue
+                if len(batch) >= self.batch_size:
+                    self.flush(model, batch, m2m_rows, position - 1)
+                    batch, m2m_rows = [], {}
+                obj = deserialize(record)
+                batch.append(obj.object)
+                for field_name, values in (obj.m2m_data or {}).items():
+                    m2m_rows.setdefault(field_name, []).extend(
+                        (obj.object.pk, value) for value in values)
+            if batch:
+                self.flush(model, batch, m2m_rows, position)
+        reset_sequences(*(apps.get_model(label) for label in MODEL_ORDER
+                          if apps.get_model(label) in self.models))
+        search.rebuild()
+        bus.publish('reset')
+        feeds.bump(feeds.SITE_SCOPE)
+        self.checkpoint.clear()
+        return self.imported
+
+    def read(self, path, label):
+        # The first pass also notes which models the dump has at all.
+        first = label == MODEL_ORDER[0]
+        with open(path, encoding='utf-8') as file:
+            for record in iter_records(file):
+                record_label = record.get('model', '').lower()
+                if first:
+                    self.present.add(record_label)
+                    if record_label not in MODEL_ORDER:
+                        self.skipped[record_label] += 1
+                if record_label == label:
+                    yield record
+
+    def flush(self, model, batch, m2m_rows, position):
+        check_references(model, batch)
+        with transaction.atomic():
+            insert(model, batch, self.ignore_conflicts)
+            insert_m2m(model, m2m_rows)
+        self.checkpoint.save(position)
+        self.ignore_conflicts = False
+        self.imported[model._meta.label_lower] += len(batch)
+        self.models.add(model)
@@ -0,0 +1,190 @@
+import json
+import platform
+import random
+import time
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from blog import bus
+from blog.client import WSGIClient
+from blog.models import Category, User
+from blog.seeding import seed
+from blog.views import get_all_posts, get_published_posts
+
+PATHS = ('index', 'category', 'profile', 'detail', 'comment_create')
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    index = max(0, round(percent / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(latencies, elapsed):
+    milliseconds = [latency * 1000 for latency in latencies]
+    return {
+        'requests': len(latencies),
+        'mean_ms': sum(milliseconds) / len(milliseconds),
+        'p50_ms': percentile(milliseconds, 50),
+        'p90_ms': percentile(milliseconds, 90),
+        'p99_ms': percentile(milliseconds, 99),
+        'max_ms': max(milliseconds),
+        'rps': len(latencies) / elapsed,
+    }
+
+
+def compare(results, baseline, threshold, metric='p90_ms'):
+    regressions = []
+    for name, stats in results['paths'].items():
+        base = baseline.get('paths', {}).get(name)
+        if base is None:
+            continue
+        if stats[metric] > base[metric] * (1 + threshold):
+            regressions.append((name, base[metric], stats[metric]))
+    return regressions
+
+
+def isolated_caches():
+    # The benchmark database is thrown away, and so must be everything
+    # cached from it, not written to the cache the site itself uses.
+    return {
+        **settings.CACHES,
+        'default': {**settings.CACHES['default'], 'LOCATION': 'benchmark'},
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'benchmark',
+        },
+    }
+
+
+def make_requests(client, rng, pages):
+    category = Category.objects.filter(is_published=True).order_by('pk')[0]
+    author = (User.objects.filter(post__isnull=False)
+              .order_by('pk').first())
+    posts = get_published_posts(get_all_posts())
+    post_ids = list(posts.values_list('pk', flat=True)[:100])
+    client.login(author)
+    client.get(reverse('blog:post_detail', args=(post_ids[0],)))
+    return {
+        'index': lambda: client.get(
+            f"{reverse('blog:index')}?page={rng.randint(1, pages)}"),
+        'category': lambda: client.get(
+            reverse('blog:category_posts', args=(category.slug,))),
+        'profile': lambda: client.get(
+            reverse('blog:profile', args=(author.username,))),
+        'detail': lambda: client.get(
+            reverse('blog:post_detail', args=(rng.choice(post_ids),))),
+        'comment_create': lambda: client.post(
+            reverse('blog:add_comment', args=(rng.choice(post_ids),)),
+            {'text': 'Комментарий из бенчмарка'}),
+    }
+
+
+def run(requests, count, warmup):
+    paths = {}
+    for name, send in requests.items():
+        for _ in range(warmup):
+            send()
+        latencies = []
+        started = time.perf_counter()
+        for _ in range(count):
+            request_started = time.perf_counter()
+            response = send()
+            latencies.append(time.perf_counter() - request_started)
+            if response.status_code >= 400:
+                raise CommandError(
+                    f'{name}: ответ со статусом {response.status_code}')
+        paths[name] = summarize(latencies, time.perf_counter() - started)
+    return paths
+
+
+class Command(BaseCommand):
+    help = ('Измеряет задержки и пропускную способность основных страниц '
+            'блога на сгенерированном наборе данных.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--comments', type=int, default=50_000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Число замеров на каждую страницу.')
+        parser.add_argument('--warmup', type=int, default=10)
+        parser.add_argument('--paths', nargs='+', choices=PATHS,
+                            default=PATHS)
+        parser.add_argument('--output', help='Файл для результатов в JSON.')
+        parser.add_argument('--baseline',
+                            help='Результаты прошлого запуска для сравнения.')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Допустимый рост p90, доля от базового.')
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['categories'],
+               options['locations'], options['posts']) < 1:
+            raise CommandError('Нужно хотя бы по одному объекту каждого типа.')
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # All requests come from one user, which rate limits would stop.
+            with override_settings(
+                    DEBUG=False, RATE_LIMITS={}, CACHES=isolated_caches(),
+                    INVALIDATION_BUS={'BACKEND': 'blog.bus.LocalBus'}):
+                bus.get_bus.cache_clear()
+                try:
+                    results = self.benchmark(options)
+                finally:
+                    caches['default'].clear()
+                    bus.get_bus.cache_clear()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+            regressions = compare(results, baseline, options['threshold'])
+            if regressions:
+                raise CommandError('Замедление относительно базового: ' + (
+                    ', '.join(f'{name} {old:.1f} -> {new:.1f} мс'
+                              for name, old, new in regressions)))
+
+    def benchmark(self, options):
+        dataset_options = {
+            key: options[key] for key in ('users', 'categories', 'locations',
+                                          'posts', 'comments', 'seed')
+        }
+        started = time.perf_counter()
+        seed(**dataset_options)
+        self.stdout.write(
+            f'Данные созданы за {time.perf_counter() - started:.1f} с')
+        rng = random.Random(options['seed'])
+        requests = make_requests(
+            WSGIClient(), rng, pages=min(5, max(1, options['posts'] // 10)))
+        requests = {name: requests[name] for name in options['paths']}
+        return {
+            'dataset': dataset_options,
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'paths': run(requests, options['requests'], options['warmup']),
+        }
+
+    def report(self, results):
+        for name, stats in results['paths'].items():
+            self.stdout.write(
+                f"{name:<16} p50 {stats['p50_ms']:8.2f} мс  "
+                f"p90 {stats['p90_ms']:8.2f} мс  "
+                f"p99 {stats['p99_ms']:8.2f} мс  "
+                f"{stats['rps']:8.1f} запр./с")
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.exporting import CHUNK_SIZE, FORMATS, export
+from blog.models import Comment, Post
+from blog.views import get_all_posts, get_published_posts
+
+
+class Command(BaseCommand):
+    help = ('Потоково выгружает публикации и комментарии сайта в JSONL '
+            'или CSV.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=FORMATS, default='jsonl')
+        parser.add_argument('--output', help='Файл, по умолчанию stdout.')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--author', help='Только данные пользователя.')
+        parser.add_argument('--published', action='store_true',
+                            help='Только опубликованные публикации и '
+                                 'комментарии к ним.')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size должен быть больше 0.')
+        posts, comments = Post.objects.all(), Comment.objects.all()
+        if options['author']:
+            posts = posts.filter(author__username=options['author'])
+            comments = comments.filter(author__username=options['author'])
+        if options['published']:
+            posts = get_published_posts(posts)
+            comments = comments.filter(
+                post__in=get_published_posts(get_all_posts()))
+        chunks = export(posts, comments, options['format'],
+                        options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as file:
+            file.writelines(chunks)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from blog.importing import BATCH_SIZE, Checkpoint, DumpError, DumpImporter
+
+
+class Command(BaseCommand):
+    help = ('Потоково загружает дамп моделей блога (JSON или JSONL) '
+            'пакетами через bulk insert. Модели могут идти в любом '
+            'порядке, например как в выводе dumpdata: файл читается '
+            'по разу на каждую модель. Прерванную загрузку можно '
+            'продолжить с флагом --resume.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('dump')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--checkpoint',
+                            help='Файл с прогрессом, по умолчанию '
+                                 '<dump>.checkpoint.')
+        parser.add_argument('--resume', action='store_true',
+                            help='Продолжить с последнего сохранённого '
+                                 'пакета.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше 0.')
+        checkpoint = Checkpoint(
+            options['checkpoint'] or f"{options['dump']}.checkpoint")
+        importer = DumpImporter(checkpoint, options['batch_size'],
+                                options['resume'])
+        if importer.skip:
+            self.stdout.write(f'Пропускаем {importer.skip} записей.')
+        try:
+            imported = importer.run(options['dump'])
+        except (DumpError, IntegrityError, ValueError) as error:
+            raise CommandError(
+                f'{error}\nИсправьте дамп и запустите команду с --resume.')
+        for label, count in imported.items():
+            self.stdout.write(f'{label}: {count}')
+        for label, count in importer.skipped.items():
+            self.stdout.write(f'{label}: пропущено {count}')
+        self.stdout.write(self.style.SUCCESS('Загрузка завершена.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.deletion import BATCH_SIZE, purge
+from blog.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = ('Удаляет помеченные на удаление публикации и пользователей '
+            'вместе с комментариями и изображениями небольшими пакетами.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Строк в одной транзакции.')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Пауза между пакетами в секундах, чтобы '
+                                 'другие запросы успевали писать в БД.')
+        parser.add_argument('--limit', type=int,
+                            help='Сколько объектов удалить за запуск.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['pause'] < 0:
+            raise CommandError('--batch-size должен быть больше 0, '
+                               '--pause не может быть отрицательной.')
+        tombstones = Tombstone.objects.select_related('user', 'post')
+        if options['limit'] is not None:
+            tombstones = tombstones[:options['limit']]
+        purged = 0
+        for tombstone in list(tombstones):
+            purge(tombstone, options['batch_size'], options['pause'])
+            self.stdout.write(f'Удалено: {tombstone.user or tombstone.post}')
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f'Готово, объектов: {purged}.'))
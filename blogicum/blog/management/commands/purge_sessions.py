@@ -0,0 +1,27 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blog.deletion import delete_in_batches
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = ('Удаляет истёкшие сессии из базы небольшими пакетами, не '
+            'блокируя таблицу надолго, в отличие от clearsessions.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Строк в одной транзакции.')
+        parser.add_argument('--pause', type=float, default=0,
+                            help='Пауза между пакетами в секундах.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['pause'] < 0:
+            raise CommandError('--batch-size должен быть больше 0, '
+                               '--pause не может быть отрицательной.')
+        deleted = delete_in_batches(
+            Session.objects.filter(expire_date__lt=timezone.now()),
+            options['batch_size'], options['pause'])
+        self.stdout.write(self.style.SUCCESS(f'Удалено сессий: {deleted}.'))
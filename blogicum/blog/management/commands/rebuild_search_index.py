@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс публикаций.'
+
+    def handle(self, *args, **options):
+        search.rebuild()
+        self.stdout.write(self.style.SUCCESS('Индекс перестроен.'))
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.seeding import BATCH_SIZE, seed
+
+
+class Command(BaseCommand):
+    help = ('Заполняет базу синтетическими пользователями, категориями, '
+            'местоположениями, публикациями и комментариями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--locations', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--comments', type=int, default=500_000)
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Одинаковый seed даёт одинаковые данные.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--days', type=int, default=365,
+                            help='Глубина архива публикаций в днях.')
+        parser.add_argument('--unpublished', type=float, default=0.05,
+                            help='Доля снятых с публикации объектов.')
+        parser.add_argument('--future', type=float, default=0.02,
+                            help='Доля отложенных публикаций.')
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['categories'],
+               options['locations']) < 1:
+            raise CommandError('Нужно хотя бы по одному пользователю, '
+                               'категории и местоположению.')
+        if options['comments'] and not options['posts']:
+            raise CommandError('Комментариям нужны публикации.')
+        if options['batch_size'] < 1 or options['days'] < 1:
+            raise CommandError('--batch-size и --days должны быть больше 0.')
+        started = time.perf_counter()
+        dataset = seed(
+            users=options['users'],
+            categories=options['categories'],
+            locations=options['locations'],
+            posts=options['posts'],
+            comments=options['comments'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            days=options['days'],
+            unpublished=options['unpublished'],
+            future=options['future'],
+            progress=self.progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово за {time.perf_counter() - started:.1f} с: '
+            f'публикации {dataset.posts.start}-{dataset.posts.stop - 1}.'
+        ))
+
+    def progress(self, model, elapsed):
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {elapsed:.1f} с')
@@ -0,0 +1,47 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.outbox import BATCH_SIZE, MAX_ATTEMPTS, claim, deliver
+
+
+class Command(BaseCommand):
+    help = ('Отправляет письма из очереди пакетами через одно соединение '
+            'с почтовым сервером.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--rate', type=float, default=0,
+                            help='Не больше писем в секунду, 0 — без '
+                                 'ограничения.')
+        parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS)
+        parser.add_argument('--loop', action='store_true',
+                            help='Не завершаться, ждать новые письма.')
+        parser.add_argument('--interval', type=float, default=5,
+                            help='Пауза между опросами очереди в секундах.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['rate'] < 0:
+            raise CommandError('--batch-size должен быть больше 0, '
+                               '--rate не может быть отрицательным.')
+        # deliver() opens the connection, and reopens it after errors.
+        connection = get_connection()
+        total_sent = total_failed = 0
+        try:
+            while True:
+                records = claim(options['batch_size'],
+                                options['max_attempts'])
+                if records:
+                    sent, failed = deliver(records, connection,
+                                           options['rate'])
+                    total_sent += sent
+                    total_failed += failed
+                elif options['loop']:
+                    time.sleep(options['interval'])
+                else:
+                    break
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено: {total_sent}, ошибок: {total_failed}.'))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog.warmup import PAGES, PROFILES, warm
+
+
+class Command(BaseCommand):
+    help = ('Заранее открывает первые страницы ленты, страницы '
+            'опубликованных категорий и самых активных авторов, чтобы '
+            'после выкладки их не пришлось собирать первым посетителям. '
+            'Заполняет только общий кеш; шаблоны, маршруты и кеши в '
+            'памяти воркеров загружает переменная BLOGICUM_WARM_CACHES.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=PAGES,
+                            help='Сколько страниц главной ленты открыть.')
+        parser.add_argument('--profiles', type=int, default=PROFILES,
+                            help='Сколько профилей авторов открыть.')
+
+    def handle(self, *args, **options):
+        if options['pages'] < 0 or options['profiles'] < 0:
+            raise CommandError('--pages и --profiles не могут быть '
+                               'отрицательными.')
+        results = warm(pages=options['pages'], profiles=options['profiles'],
+                       progress=self.report)
+        failed = sum(result[2] for result in results)
+        if failed:
+            raise CommandError(f'Страниц с ошибкой: {failed}.')
+        total = sum(result[3] for result in results)
+        self.stdout.write(self.style.SUCCESS(f'Готово за {total:.2f} с.'))
+
+    def report(self, name, requested, failed, elapsed):
+        self.stdout.write(f'{name:<12} страниц: {requested:>4}  '
+                          f'ошибок: {failed:>3}  {elapsed:8.2f} с')
@@ -0,0 +1,198 @@
+import hashlib
+import math
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.http import HttpResponse
+
+from blog import bus, concurrency
+from blog.cache import LRUCache
+from blog.fragments import is_fragment_request
+
+STALE_WARNING = '110 - "Response is Stale"'
+
+
+class InvalidationMiddleware:
+    """Applies invalidation events published by other workers before the
+    request reads any per-process cache.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        bus.get_bus().poll()
+        return self.get_response(request)
+
+
+class SlowQuery(OperationalError):
+    pass
+
+
+class CircuitBreaker:
+    """Opens for `cooldown` seconds after `failures` failures in a row.
+
+    After the cooldown a single failure opens it again, a success closes
+    it for good.
+    """
+
+    def __init__(self, failures, cooldown):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.count = 0
+        self.opened_until = 0
+        self.lock = threading.Lock()
+
+    def is_open(self):
+        return time.monotonic() < self.opened_until
+
+    def retry_after(self):
+        return max(1, math.ceil(self.opened_until - time.monotonic()))
+
+    def record_failure(self):
+        with self.lock:
+            self.count += 1
+            if self.count >= self.failures:
+                self.opened_until = time.monotonic() + self.cooldown
+                self.count = self.failures - 1
+
+    def record_success(self):
+        with self.lock:
+            self.count = 0
+
+
+def is_anonymous_get(request):
+    return (request.method == 'GET'
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES)
+
+
+def stale_key(request):
+    path = request.get_full_path().encode()
+    kind = 'fragment' if is_fragment_request(request) else 'page'
+    return f'stale:{kind}:{hashlib.md5(path).hexdigest()}'
+
+
+def get_stale_response(request):
+    page = cache.get(stale_key(request))
+    if page is None:
+        return None
+    response = HttpResponse(page['content'],
+                            content_type=page['content_type'])
+    response['Warning'] = STALE_WARNING
+    return response
+
+
+def unavailable(retry_after):
+    response = HttpResponse('Сервис временно недоступен.', status=503,
+                            content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = retry_after
+    return response
+
+
+class StaleFallbackMiddleware:
+    """Serves anonymous GET pages from their last good copy, with a
+    Warning header, when the database raises OperationalError or a query
+    runs longer than DB_LATENCY_BUDGET seconds.
+
+    Such failures feed a per-process circuit breaker; while it is open
+    requests do not reach the database at all: anonymous pages come from
+    their copies, everything else gets 503.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.breaker = CircuitBreaker(settings.DB_BREAKER_FAILURES,
+                                      settings.DB_BREAKER_COOLDOWN)
+        # Paths whose copy this worker saved recently.
+        self.saved = LRUCache(10_000, settings.STALE_PAGE_REFRESH)
+
+    def __call__(self, request):
+        anonymous = is_anonymous_get(request)
+        if self.breaker.is_open():
+            return self.get_stale(request, anonymous) or self.unavailable()
+        request.db_failed = False
+        with connection.execute_wrapper(
+                partial(self.watch, request, anonymous)):
+            response = self.get_response(request)
+        if request.db_failed:
+            self.breaker.record_failure()
+            if response.status_code >= 500:
+                return self.get_stale(request, anonymous) or response
+        else:
+            self.breaker.record_success()
+        if anonymous:
+            self.save(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, OperationalError):
+            request.db_failed = True
+
+    def watch(self, request, anonymous, execute, sql, params, many, context):
+        started = time.monotonic()
+        try:
+            result = execute(sql, params, many, context)
+        except OperationalError:
+            request.db_failed = True
+            raise
+        if time.monotonic() - started > settings.DB_LATENCY_BUDGET:
+            request.db_failed = True
+            # Give up on the request only if there is a copy to serve.
+            if anonymous and cache.get(stale_key(request)) is not None:
+                raise SlowQuery('Запрос к базе данных выполнялся дольше '
+                                f'{settings.DB_LATENCY_BUDGET} с.')
+        return result
+
+    def save(self, request, response):
+        key = stale_key(request)
+        # A page with a CSRF token belongs to the visitor's cookie.
+        if (response.status_code != 200 or response.streaming
+                or response.cookies or request.META.get('CSRF_COOKIE_USED')
+                or self.saved.get(key)):
+            return
+        cache.set(key, {'content': response.content,
+                        'content_type': response['Content-Type']},
+                  settings.STALE_PAGE_TIMEOUT)
+        self.saved.set(key, True)
+
+    def get_stale(self, request, anonymous):
+        return get_stale_response(request) if anonymous else None
+
+    def unavailable(self):
+        return unavailable(self.breaker.retry_after())
+
+
+class ConcurrencyLimitMiddleware:
+    """Caps the requests this worker serves at once, see CONCURRENCY_LIMIT.
+
+    Requests over the cap wait in a short queue and then get 503. An
+    anonymous GET over the cap is answered with the saved copy of the
+    page, if StaleFallbackMiddleware has one, without taking a slot.
+    Requests that classify() leaves without a class are not limited.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        limiter = concurrency.get_limiter()
+        name = concurrency.classify(request)
+        if name is None:
+            return self.get_response(request)
+        if not limiter.acquire(name, wait=False):
+            stale = (get_stale_response(request)
+                     if is_anonymous_get(request) else None)
+            if stale is not None:
+                limiter.count(name, 'stale')
+                return stale
+            if not limiter.acquire(name):
+                limiter.count(name, 'rejected')
+                return unavailable(settings.CONCURRENCY_RETRY_AFTER)
+        try:
+            return self.get_response(request)
+        finally:
+            limiter.release(name)
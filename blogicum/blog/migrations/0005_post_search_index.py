@@ -0,0 +1,46 @@
+from django.db import migrations
+
+SQL = {
+    'sqlite': (
+        "CREATE VIRTUAL TABLE blog_post_fts USING fts5("
+        "title, text, tokenize='unicode61 remove_diacritics 2')",
+        'INSERT INTO blog_post_fts (rowid, title, text) '
+        'SELECT id, title, text FROM blog_post',
+    ),
+    'postgresql': (
+        'ALTER TABLE blog_post ADD COLUMN search_vector tsvector '
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('russian', coalesce(text, '')), 'B')) STORED",
+        'CREATE INDEX blog_post_search_vector_idx ON blog_post '
+        'USING GIN (search_vector)',
+    ),
+}
+REVERSE_SQL = {
+    'sqlite': ('DROP TABLE blog_post_fts',),
+    'postgresql': (
+        'DROP INDEX blog_post_search_vector_idx',
+        'ALTER TABLE blog_post DROP COLUMN search_vector',
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    for sql in SQL.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    for sql in REVERSE_SQL.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_alter_post_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:10
+
+from django.conf import settings
+from django.db import migrations, models
+import blog.functions
+
+USERNAME_INDEX = models.Index(blog.functions.CaseFold('username'),
+                              name='blog_user_username_casefold')
+
+
+# The user model belongs to another app, so its index for the
+# autocomplete fallback is created here rather than in its Meta.
+def add_username_index(apps, schema_editor):
+    schema_editor.add_index(apps.get_model(settings.AUTH_USER_MODEL),
+                            USERNAME_INDEX)
+
+
+def remove_username_index(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model(settings.AUTH_USER_MODEL),
+                               USERNAME_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0005_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(blog.functions.CaseFold('title'), name='blog_category_title_casefold'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(blog.functions.CaseFold('name'), name='blog_location_name_casefold'),
+        ),
+        migrations.RunPython(add_username_index, remove_username_index),
+    ]
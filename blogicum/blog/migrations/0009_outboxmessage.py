@@ -0,0 +1,40 @@
+# Generated by Django 3.2.16 on 2026-10-19 08:31
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_tombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=256, verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('html_body', models.TextField(blank=True, verbose_name='HTML')),
+                ('from_email', models.CharField(max_length=256, verbose_name='Отправитель')),
+                ('to', models.TextField(verbose_name='Получатели')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Добавлено')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Отправить после')),
+                ('claim', models.CharField(blank=True, max_length=32, verbose_name='Обработчик')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Попытки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Отправлено')),
+            ],
+            options={
+                'verbose_name': 'письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ('created_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outboxmessage',
+            index=models.Index(fields=['sent_at', 'send_after'], name='blog_outbox_sent_at_d17074_idx'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from blog.functions import CaseFold
 
 User = get_user_model()
 
@@ -27,6 +30,8 @@ class Category(PublishedModel):
     class Meta:
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = (models.Index(CaseFold('title'),
+                                name='blog_category_title_casefold'),)
 
     def __str__(self):
         return self.title
@@ -38,6 +43,8 @@ class Location(PublishedModel):
     class Meta:
         verbose_name = 'местоположение'
         verbose_name_plural = 'Местоположения'
+        indexes = (models.Index(CaseFold('name'),
+                                name='blog_location_name_casefold'),)
 
     def __str__(self):
         return self.name
@@ -49,7 +56,8 @@ class Post(PublishedModel):
     help_text_pub_date = 'Если установить дату и время в будущем — \
 можно делать отложенные публикации.'
     pub_date = models.DateTimeField('Дата и время публикации',
-                                    help_text=help_text_pub_date)
+                                    help_text=help_text_pub_date,
+                                    db_index=True)
     image = models.ImageField('Изображение',
                               upload_to='post_images',
                               null=True,
@@ -91,3 +99,48 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at', )
+
+
+class Tombstone(models.Model):
+    user = models.OneToOneField(User,
+                                on_delete=models.CASCADE,
+                                verbose_name='Пользователь',
+                                related_name='tombstone',
+                                null=True,
+                                blank=True)
+    post = models.OneToOneField(Post,
+                                on_delete=models.CASCADE,
+                                verbose_name='Публикация',
+                                related_name='tombstone',
+                                null=True,
+                                blank=True)
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'объект на удаление'
+        verbose_name_plural = 'Объекты на удаление'
+        ordering = ('created_at', )
+
+
+class OutboxMessage(models.Model):
+    subject = models.CharField('Тема', max_length=256)
+    body = models.TextField('Текст')
+    html_body = models.TextField('HTML', blank=True)
+    from_email = models.CharField('Отправитель', max_length=256)
+    to = models.TextField('Получатели')
+    created_at = models.DateTimeField('Добавлено', auto_now_add=True)
+    send_after = models.DateTimeField('Отправить после',
+                                      default=timezone.now)
+    claim = models.CharField('Обработчик', max_length=32, blank=True)
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    sent_at = models.DateTimeField('Отправлено', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('created_at', )
+        indexes = (models.Index(fields=('sent_at', 'send_after')), )
+
+    def __str__(self):
+        return self.subject
@@ -0,0 +1,100 @@
+import smtplib
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.mail import EmailMultiAlternatives
+from django.utils import timezone
+
+from blog.models import OutboxMessage
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+LEASE = timedelta(minutes=5)
+RETRY_DELAY = timedelta(minutes=1)
+
+
+def enqueue(message):
+    html_body = next((content for content, mimetype
+                      in getattr(message, 'alternatives', ())
+                      if mimetype == 'text/html'), '')
+    return OutboxMessage.objects.create(
+        subject=message.subject, body=message.body, html_body=html_body,
+        from_email=message.from_email, to=', '.join(message.to))
+
+
+def to_email(record):
+    message = EmailMultiAlternatives(
+        record.subject, record.body, record.from_email,
+        record.to.split(', '))
+    if record.html_body:
+        message.attach_alternative(record.html_body, 'text/html')
+    return message
+
+
+def claim(batch_size=BATCH_SIZE, max_attempts=MAX_ATTEMPTS):
+    """Leases a batch of due messages to this worker.
+
+    The conditional UPDATE lets several workers poll the same table
+    without sending a message twice and without holding a transaction
+    open while talking to the mail server. Messages of a crashed worker
+    become due again when the lease runs out.
+    """
+    now = timezone.now()
+    token = uuid.uuid4().hex
+    due = OutboxMessage.objects.filter(sent_at__isnull=True,
+                                       send_after__lte=now,
+                                       attempts__lt=max_attempts)
+    pks = list(due.order_by('send_after').values_list('pk', flat=True)
+               [:batch_size])
+    due.filter(pk__in=pks).update(send_after=now + LEASE, claim=token)
+    return list(OutboxMessage.objects.filter(claim=token))
+
+
+def defer(record, error):
+    record.attempts += 1
+    record.last_error = f'{type(error).__name__}: {error}'
+    record.send_after = (timezone.now()
+                         + RETRY_DELAY * 2 ** (record.attempts - 1))
+    record.save(update_fields=('attempts', 'last_error', 'send_after'))
+
+
+def connect(connection, reopen=False):
+    # Returns the error instead of raising it if the server is down.
+    try:
+        if reopen:
+            connection.close()
+        connection.open()
+    except (smtplib.SMTPException, OSError) as error:
+        return error
+    return None
+
+
+def deliver(records, connection, rate=0):
+    """Sends the records through `connection`, opening it if needed.
+
+    A failed message is retried later with an exponential backoff. If the
+    mail server cannot be reached, the rest of the batch is deferred the
+    same way, so that attempts and their limit still apply.
+    """
+    sent = failed = 0
+    error = connect(connection)
+    for index, record in enumerate(records):
+        if error is not None:
+            for rest in records[index:]:
+                defer(rest, error)
+            return sent, failed + len(records) - index
+        started = time.monotonic()
+        try:
+            connection.send_messages([to_email(record)])
+        except (smtplib.SMTPException, OSError) as send_error:
+            defer(record, send_error)
+            failed += 1
+            error = connect(connection, reopen=True)
+        else:
+            record.sent_at = timezone.now()
+            record.save(update_fields=('sent_at',))
+            sent += 1
+        if rate:
+            time.sleep(max(0, 1 / rate - (time.monotonic() - started)))
+    return sent, failed
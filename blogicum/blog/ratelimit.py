@@ -0,0 +1,93 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from blog.cache import LRUCache
+
+# Per-process buckets, used while the cache is unavailable.
+LOCAL = LRUCache(10_000, 24 * 60 * 60)
+LOCAL_LOCK = threading.Lock()
+
+
+def hit_shared(key, interval, period, now):
+    # GCRA: the bucket is the time (in ms) at which it is full again,
+    # moved forward by `interval` per request with an atomic incr().
+    timeout = math.ceil(period / 1000)
+    try:
+        full_at = cache.incr(key, interval)
+    except ValueError:
+        if cache.add(key, now + interval, timeout):
+            return 0
+        full_at = cache.incr(key, interval)
+    if full_at - interval < now:
+        # The bucket was full; two requests racing here may both pass.
+        cache.set(key, now + interval, timeout)
+        return 0
+    if full_at - now > period:
+        cache.decr(key, interval)
+        return full_at - now - period
+    cache.touch(key, timeout)
+    return 0
+
+
+def hit_local(key, interval, period, now):
+    with LOCAL_LOCK:
+        full_at = max(LOCAL.get(key, now), now) + interval
+        if full_at - now > period:
+            return full_at - now - period
+        LOCAL.set(key, full_at)
+        return 0
+
+
+def hit(name, who):
+    """Takes a token from the `name` bucket of `who` and returns 0, or
+    the number of seconds until a token is available if there is none.
+
+    RATE_LIMITS[name] allows `capacity` requests at once, refilled evenly
+    over `period` seconds; names missing from it are not limited.
+    """
+    limit = settings.RATE_LIMITS.get(name)
+    if limit is None:
+        return 0
+    period = limit['period'] * 1000
+    interval = period // limit['capacity']
+    key = f'ratelimit:{name}:{who}'
+    now = int(time.time() * 1000)
+    try:
+        wait = hit_shared(key, interval, period, now)
+    except Exception:
+        # Cache backends raise their own errors when unavailable.
+        wait = hit_local(key, interval, period, now)
+    return math.ceil(wait / 1000)
+
+
+def get_client_key(request):
+    # The session is read before any model is queried.
+    user_id = request.session.get(SESSION_KEY)
+    if user_id is not None:
+        return f'user:{user_id}'
+    return f"ip:{request.META.get('REMOTE_ADDR')}"
+
+
+class RateLimitMixin:
+    """Answers POST requests over the RATE_LIMITS[rate_limit] bucket of
+    the user, or of the IP address for anonymous visitors, with 429.
+    """
+
+    rate_limit = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == 'POST':
+            wait = hit(self.rate_limit, get_client_key(request))
+            if wait:
+                response = HttpResponse(
+                    'Слишком много запросов, попробуйте позже.', status=429,
+                    content_type='text/plain; charset=utf-8')
+                response['Retry-After'] = wait
+                return response
+        return super().dispatch(request, *args, **kwargs)
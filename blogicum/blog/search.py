@@ -0,0 +1,110 @@
+import re
+
+from django.db import NotSupportedError, connection
+
+from blog.feeds import add_comment_counts
+
+SQLITE_TABLE = 'blog_post_fts'
+POSTGRES_CONFIG = 'russian'
+
+
+def index_post(post):
+    # PostgreSQL keeps the generated column up to date by itself.
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s',
+                       [post.pk])
+        cursor.execute(
+            f'INSERT INTO {SQLITE_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)', [post.pk, post.title, post.text])
+
+
+def unindex_post(post):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE} WHERE rowid = %s',
+                       [post.pk])
+
+
+def rebuild():
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SQLITE_TABLE} (rowid, title, text) '
+                'SELECT id, title, text FROM blog_post')
+        elif connection.vendor == 'postgresql':
+            cursor.execute('REINDEX INDEX blog_post_search_vector_idx')
+
+
+ENDINGS = re.compile(
+    r'(ами|ями|ого|его|ому|ему|ыми|ими|ая|яя|ое|ее|ой|ей|ий|ый|ов|ев|ах|ях|'
+    r'ам|ям|ом|ем|а|я|о|е|ы|и|у|ю|ь|й)$')
+
+
+def stem(word):
+    # FTS5 has no Russian stemmer: drop a common ending and match the rest
+    # as a prefix, so that "море" also finds "морю".
+    stemmed = ENDINGS.sub('', word.lower())
+    return stemmed if len(stemmed) >= 3 else word.lower()
+
+
+def make_sqlite_query(query):
+    words = re.findall(r'\w+', query)
+    return ' '.join('"{}"*'.format(stem(word)) for word in words)
+
+
+def parse_cursor(value):
+    try:
+        rank, pk = (value or '').split(':')
+        return float(rank), int(pk)
+    except ValueError:
+        return None
+
+
+def make_cursor(post):
+    return f'{post.search_rank!r}:{post.pk}'
+
+
+def search(queryset, query, after=None, limit=10):
+    """Ranked keyset page of posts from `queryset` matching `query`.
+
+    Lower `search_rank` is better. Returns the posts and the cursor
+    for the next page, or None if this page is the last one.
+    """
+    if connection.vendor == 'sqlite':
+        query = make_sqlite_query(query)
+        rank = f'bm25({SQLITE_TABLE}, 10.0, 1.0)'
+        tables = [SQLITE_TABLE]
+        where = [f'{SQLITE_TABLE}.rowid = blog_post.id',
+                 f'{SQLITE_TABLE} MATCH %s']
+    elif connection.vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{POSTGRES_CONFIG}', %s)"
+        rank = ('(-ts_rank(blog_post.search_vector, '
+                f'{tsquery}))::double precision')
+        tables = []
+        where = [f'blog_post.search_vector @@ {tsquery}']
+    else:
+        raise NotSupportedError(
+            'Полнотекстовый поиск работает только с SQLite и PostgreSQL.')
+    if not query.strip():
+        return [], None
+    params = [query]
+    select_params = [] if tables else [query]
+    cursor = parse_cursor(after)
+    if cursor is not None:
+        where.append(f'({rank} > %s OR ({rank} = %s AND blog_post.id > %s))')
+        rank_params = [] if tables else [query]
+        params += [*rank_params, cursor[0], *rank_params, cursor[0],
+                   cursor[1]]
+    posts = list(queryset.extra(
+        select={'search_rank': rank}, select_params=select_params,
+        tables=tables, where=where, params=params,
+    ).order_by('search_rank', 'id')[:limit + 1])
+    next_cursor = None
+    if len(posts) > limit:
+        posts = posts[:limit]
+        next_cursor = make_cursor(posts[-1])
+    return add_comment_counts(posts), next_cursor
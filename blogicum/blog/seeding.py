@@ -0,0 +1,135 @@
+import random
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from blog import bus, feeds, search
+from blog.models import Category, Comment, Location, Post, User
+
+BATCH_SIZE = 5000
+WORDS = ('день', 'утро', 'вечер', 'город', 'море', 'лес', 'дорога', 'дом',
+         'книга', 'письмо', 'обед', 'поезд', 'снег', 'солнце', 'река',
+         'друг', 'встреча', 'прогулка', 'музыка', 'театр')
+
+Dataset = namedtuple(
+    'Dataset', ('users', 'categories', 'locations', 'posts', 'comments'))
+
+
+def next_pk(model):
+    return (model.objects.aggregate(Max('pk'))['pk__max'] or 0) + 1
+
+
+def make_range(model, size):
+    start = next_pk(model)
+    return range(start, start + size)
+
+
+def make_text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def make_texts(rng, words, size=1000):
+    return [make_text(rng, words) for _ in range(size)]
+
+
+def skewed_choice(rng, values, power=3):
+    # A few authors write most posts and a few posts get most comments.
+    return values[int(len(values) * rng.random() ** power)]
+
+
+def make_pub_date(rng, now, days, future):
+    if rng.random() < future:
+        return now + timedelta(seconds=rng.randrange(1, 30 * 86400))
+    age = min(rng.expovariate(4 / days), days)
+    return now - timedelta(days=age)
+
+
+def bulk_insert(model, objects, batch_size):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+
+
+def reset_sequences(*models):
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
+
+
+def seed(users=100, categories=10, locations=50, posts=10_000,
+         comments=50_000, seed=0, batch_size=BATCH_SIZE, days=365,
+         unpublished=0.05, future=0.02, progress=None):
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(None)
+    titles, texts = make_texts(rng, 4), make_texts(rng, 40)
+    comment_texts = make_texts(rng, 12)
+    dataset = Dataset(
+        users=make_range(User, users),
+        categories=make_range(Category, categories),
+        locations=make_range(Location, locations),
+        posts=make_range(Post, posts),
+        comments=make_range(Comment, comments),
+    )
+    steps = (
+        (User, (
+            User(pk=pk, username=f'user{pk}', password=password,
+                 email=f'user{pk}@example.com')
+            for pk in dataset.users
+        )),
+        (Category, (
+            Category(pk=pk,
+                     title=make_text(rng, 2),
+                     slug=f'category-{pk}',
+                     description=make_text(rng, 12),
+                     is_published=rng.random() >= unpublished)
+            for pk in dataset.categories
+        )),
+        (Location, (
+            Location(pk=pk,
+                     name=make_text(rng, 1),
+                     is_published=rng.random() >= unpublished)
+            for pk in dataset.locations
+        )),
+        (Post, (
+            Post(pk=pk,
+                 title=rng.choice(titles),
+                 text=rng.choice(texts),
+                 pub_date=make_pub_date(rng, now, days, future),
+                 is_published=rng.random() >= unpublished,
+                 author_id=skewed_choice(rng, dataset.users),
+                 category_id=rng.choice(dataset.categories),
+                 location_id=rng.choice(dataset.locations))
+            for pk in dataset.posts
+        )),
+        (Comment, (
+            Comment(pk=pk,
+                    text=rng.choice(comment_texts),
+                    post_id=skewed_choice(rng, dataset.posts),
+                    author_id=rng.choice(dataset.users))
+            for pk in dataset.comments
+        )),
+    )
+    for model, objects in steps:
+        started = time.perf_counter()
+        bulk_insert(model, objects, batch_size)
+        if progress is not None:
+            progress(model, time.perf_counter() - started)
+    reset_sequences(User, Category, Location, Post, Comment)
+    search.rebuild()
+    bus.publish('reset')
+    feeds.bump(feeds.SITE_SCOPE)
+    return dataset
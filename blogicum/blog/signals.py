@@ -0,0 +1,153 @@
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from blog import autocomplete, bus, catalog, feeds, search, users
+from blog.models import Category, Comment, Location, Post, Tombstone, User
+
+# Sent after queryset.update(), which bypasses post_save. Receivers get
+# only the model: the updated rows may be too many to list.
+bulk_updated = Signal()
+
+
+# Raw saves are indexed too, so that loaddata fills the search index.
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, **kwargs):
+    search.index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    search.unindex_post(instance)
+
+
+# Per-process caches are updated through the invalidation bus, so that
+# every worker applies the change, not only the one that made it.
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+def update_autocomplete(sender, instance, **kwargs):
+    bus.publish('autocomplete', model=sender._meta.label, pk=instance.pk,
+                values=autocomplete.get_values(instance))
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def delete_from_autocomplete(sender, instance, **kwargs):
+    bus.publish('autocomplete', model=sender._meta.label, pk=instance.pk,
+                values=None)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user(sender, instance, **kwargs):
+    bus.publish('user', pk=instance.pk, username=instance.username)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+def forget_published(sender, **kwargs):
+    bus.publish('catalog', model=sender._meta.label)
+
+
+@receiver(bulk_updated)
+def clear_bulk_updated(sender, **kwargs):
+    bus.publish('autocomplete_reload', model=sender._meta.label)
+    if sender in (Category, Location):
+        bus.publish('catalog', model=sender._meta.label)
+    feeds.bump(feeds.SITE_SCOPE)
+
+
+@bus.subscribe('autocomplete')
+def apply_autocomplete(model, pk, values):
+    for index in autocomplete.get_indexes(apps.get_model(model)):
+        if values is None:
+            index.delete(SimpleNamespace(pk=pk))
+        else:
+            index.update(SimpleNamespace(pk=pk, **values))
+
+
+@bus.subscribe('autocomplete_reload')
+def reload_autocomplete(model):
+    for index in autocomplete.get_indexes(apps.get_model(model)):
+        index.clear()
+
+
+@bus.subscribe('user')
+def apply_forget_user(pk, username):
+    users.forget(SimpleNamespace(pk=pk, username=username))
+
+
+@bus.subscribe('catalog')
+def apply_forget_published(model):
+    catalog.forget(apps.get_model(model))
+
+
+@bus.subscribe('reset')
+def reset(**kwargs):
+    autocomplete.clear()
+    catalog.clear()
+    users.clear()
+    if hasattr(cache, 'clear_local'):
+        cache.clear_local()
+
+
+@receiver(pre_save, sender=Post)
+def remember_feed_scopes(sender, instance, **kwargs):
+    # A post moved to another category or author leaves the old feeds.
+    instance._old_feed_scopes = ()
+    if not instance._state.adding:
+        old = Post.objects.filter(pk=instance.pk).values_list(
+            'pk', 'category_id', 'author_id').first()
+        if old is not None:
+            instance._old_feed_scopes = feeds.get_post_scopes(*old)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def bump_post_feeds(sender, instance, **kwargs):
+    feeds.bump(*feeds.get_post_scopes(instance.pk, instance.category_id,
+                                      instance.author_id),
+               *getattr(instance, '_old_feed_scopes', ()))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comment_feeds(sender, instance, **kwargs):
+    feeds.bump(f'post:{instance.post_id}')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tombstone)
+@receiver(post_delete, sender=Tombstone)
+@receiver(post_delete, sender=User)
+def bump_site_feeds(sender, **kwargs):
+    feeds.bump(feeds.SITE_SCOPE)
+
+
+@receiver(pre_save, sender=User)
+def remember_feed_fields(sender, instance, update_fields=None, **kwargs):
+    # Feeds show the username, and is_active may hide the author's posts.
+    # Logins save last_login alone, so they skip the lookup.
+    instance._old_feed_fields = None
+    if not instance._state.adding and (
+            update_fields is None
+            or {'username', 'is_active'} & set(update_fields)):
+        instance._old_feed_fields = User.objects.filter(
+            pk=instance.pk).values_list('username', 'is_active').first()
+
+
+@receiver(post_save, sender=User)
+def bump_user_feeds(sender, instance, created, **kwargs):
+    # Signups, logins and password changes leave every feed as it was.
+    old = getattr(instance, '_old_feed_fields', None)
+    if not created and old is not None and old != (instance.username,
+                                                   instance.is_active):
+        feeds.bump(feeds.SITE_SCOPE)
@@ -0,0 +1,80 @@
+import threading
+
+from django.db.models.fields.related_descriptors import (
+    ForwardManyToOneDescriptor)
+from django.template.base import Node, Template
+
+_state = threading.local()
+_originals = {}
+
+
+class LazyRelationError(Exception):
+    pass
+
+
+def get_rendering_node():
+    nodes = getattr(_state, 'nodes', None)
+    return nodes[-1] if nodes else None
+
+
+def render(self, context):
+    # Operators in {% if %} swallow exceptions, so violations are
+    # collected and raised again once the outermost template is done.
+    depth = getattr(_state, 'depth', 0)
+    if not depth:
+        _state.errors = []
+    _state.depth = depth + 1
+    try:
+        result = _originals['render'](self, context)
+    finally:
+        _state.depth = depth
+    if not depth and _state.errors:
+        error = _state.errors[0]
+        _state.errors = []
+        raise error
+    return result
+
+
+def render_annotated(self, context):
+    nodes = _state.__dict__.setdefault('nodes', [])
+    nodes.append(self)
+    try:
+        return _originals['render_annotated'](self, context)
+    finally:
+        nodes.pop()
+
+
+def get_object(self, instance):
+    node = get_rendering_node()
+    if node is not None:
+        origin = getattr(node, 'origin', None)
+        token = getattr(node, 'token', None)
+        error = LazyRelationError(
+            f'Ленивая загрузка `{type(instance).__name__}.'
+            f'{self.field.name}` при рендеринге шаблона '
+            f'{origin.template_name if origin else "?"}, '
+            f'строка {token.lineno if token else "?"}. '
+            'Добавьте select_related() в запрос view-функции.'
+        )
+        _state.__dict__.setdefault('errors', []).append(error)
+        raise error
+    return _originals['get_object'](self, instance)
+
+
+def enable():
+    if _originals:
+        return
+    _originals['render'] = Template.render
+    _originals['render_annotated'] = Node.render_annotated
+    _originals['get_object'] = ForwardManyToOneDescriptor.get_object
+    Template.render = render
+    Node.render_annotated = render_annotated
+    ForwardManyToOneDescriptor.get_object = get_object
+
+
+def disable():
+    if not _originals:
+        return
+    Template.render = _originals.pop('render')
+    Node.render_annotated = _originals.pop('render_annotated')
+    ForwardManyToOneDescriptor.get_object = _originals.pop('get_object')
@@ -0,0 +1,12 @@
+from django import template
+
+from blog import catalog
+
+register = template.Library()
+
+
+@register.filter
+def published_location(location_id):
+    if location_id is None:
+        return None
+    return catalog.get_location(location_id)
@@ -6,6 +6,18 @@ app_name = 'blog'
 
 urlpatterns = [
     path('', views.IndexView.as_view(), name='index'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('autocomplete/users/',
+         views.AutocompleteView.as_view(kind='users'),
+         name='autocomplete_users'),
+    path('autocomplete/categories/',
+         views.AutocompleteView.as_view(kind='categories'),
+         name='autocomplete_categories'),
+    path('autocomplete/locations/',
+         views.AutocompleteView.as_view(kind='locations'),
+         name='autocomplete_locations'),
+    path('metrics/concurrency/',
+         views.ConcurrencyMetricsView.as_view(), name='concurrency_metrics'),
     path('profile/<str:username>/',
          views.ProfileView.as_view(), name='profile'),
     path('edit_profile/<str:username/',
@@ -0,0 +1,39 @@
+import copy
+
+from django.conf import settings
+
+from blog.cache import LRUCache
+from blog.deletion import exclude_deleted
+from blog.models import User
+
+MISSING = object()
+CACHE = LRUCache(settings.USER_CACHE_SIZE, settings.USER_CACHE_TIMEOUT)
+
+
+def get_user(field, value):
+    """User with `field` (pk or username) equal to `value`, or None.
+
+    Misses are cached too. Callers get a copy, so changing it does not
+    affect other requests.
+    """
+    user = CACHE.get((field, value), MISSING)
+    if user is MISSING:
+        user = exclude_deleted(User.objects, 'tombstone').filter(
+            **{field: value}).first()
+        CACHE.set((field, value), user)
+        if user is not None:
+            CACHE.set(('pk', user.pk), user)
+            CACHE.set(('username', user.username), user)
+    return copy.copy(user)
+
+
+def forget(user):
+    keys = [('pk', user.pk), ('username', user.username)]
+    cached = CACHE.get(('pk', user.pk))
+    if cached is not None:
+        keys.append(('username', cached.username))
+    CACHE.delete(*keys)
+
+
+def clear():
+    CACHE.clear()
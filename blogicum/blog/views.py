@@ -1,18 +1,31 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
 from django.utils import timezone
 from django.views.generic import (CreateView, DeleteView,
-                                  DetailView, ListView, UpdateView)
+                                  DetailView, ListView, UpdateView, View)
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.views import PasswordChangeView, PasswordResetView
 from django.contrib.auth.forms import User, UserCreationForm
 from django.core.paginator import Paginator
-from django.db.models import Count
-from blog.models import Category, Comment, Post
-from blog.forms import CommentForm, PostForm, UserUpdateForm
+from blog import autocomplete, catalog, concurrency, users
+from blog.deletion import exclude_deleted, schedule_deletion
+from blog.exporting import FORMATS, export
+from blog.feeds import CachedFeed, cached
+from blog.fragments import FragmentMixin
+from blog.models import Comment, Post
+from blog.ratelimit import RateLimitMixin
+from blog.forms import (CommentForm, OutboxPasswordResetForm, PostForm,
+                        UserUpdateForm)
+from blog.search import search
 
 
 def get_all_posts():
-    return Post.objects.select_related('category', 'author', 'location')
+    return exclude_deleted(
+        Post.objects.select_related('category', 'author'),
+        'tombstone', 'author__tombstone')
 
 
 def get_published_posts(queryset):
@@ -21,13 +34,17 @@ def get_published_posts(queryset):
                             category__is_published=True))
 
 
+def is_published(post):
+    return (post.is_published and post.pub_date <= timezone.now()
+            and post.category is not None and post.category.is_published)
+
+
 def get_user_posts(user):
     return get_all_posts().filter(author=user)
 
 
-def annotate(queryset):
-    return (queryset.annotate(comment_count=Count('comment'))
-                    .order_by('-pub_date'))
+def get_feed(queryset, key, *scopes):
+    return CachedFeed(queryset.order_by('-pub_date'), key, scopes)
 
 
 def get_page(request, queryset, paginate_by):
@@ -36,36 +53,100 @@ def get_page(request, queryset, paginate_by):
     return paginator.get_page(page)
 
 
-class IndexView(ListView):
+class IndexView(FragmentMixin, ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = 10
 
     def get_queryset(self):
-        return annotate(get_published_posts(get_all_posts()))
+        return get_feed(get_published_posts(get_all_posts()), 'index',
+                        'posts')
+
+
+class SearchView(ListView):
+    template_name = 'blog/search.html'
+    limit = 10
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        posts, self.next_cursor = search(
+            get_published_posts(get_all_posts()), self.query,
+            after=self.request.GET.get('after'), limit=self.limit)
+        return posts
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['next_cursor'] = self.next_cursor
+        return context
+
+
+class AutocompleteView(View):
+    kind = None
+
+    def get(self, request):
+        results = autocomplete.INDEXES[self.kind].search(
+            request.GET.get('q', ''), autocomplete.LIMIT)
+        return JsonResponse(
+            {'results': [{'id': pk, 'text': text} for pk, text in results]})
+
+
+class ConcurrencyMetricsView(View):
+
+    def get(self, request):
+        if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+            raise PermissionDenied
+        return JsonResponse(concurrency.get_limiter().snapshot())
 
 
-class RegistrationView(CreateView):
+class RegistrationView(RateLimitMixin, CreateView):
+    rate_limit = 'registration'
     template_name = 'registration/registration_form.html'
     form_class = UserCreationForm
     success_url = reverse_lazy('blog:index')
 
 
-class ProfileView(DetailView):
+class OutboxPasswordResetView(PasswordResetView):
+    form_class = OutboxPasswordResetForm
+
+
+class ProfileView(FragmentMixin, DetailView):
     model = User
     template_name = 'blog/profile.html'
 
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('export')
+        if export_format is None:
+            return super().get(request, *args, **kwargs)
+        if (export_format not in FORMATS
+                or request.user.username != kwargs.get('username')):
+            raise PermissionDenied
+        response = StreamingHttpResponse(
+            export(Post.objects.filter(author=request.user),
+                   Comment.objects.filter(author=request.user),
+                   export_format),
+            content_type=FORMATS[export_format][1])
+        response['Content-Disposition'] = (
+            f'attachment; filename="{request.user.username}.{export_format}"')
+        return response
+
     def get_object(self):
-        username = self.kwargs.get('username')
-        return get_object_or_404(self.model, username=username)
+        user = users.get_user('username', self.kwargs.get('username'))
+        if user is None:
+            raise Http404
+        return user
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.object
         context['profile'] = user
-        posts = annotate(get_user_posts(user))
-        if user != self.request.user:
-            posts = get_published_posts(posts)
+        posts = get_user_posts(user)
+        if user == self.request.user:
+            posts = get_feed(posts, f'author:{user.pk}:all',
+                             f'author:{user.pk}')
+        else:
+            posts = get_feed(get_published_posts(posts),
+                             f'author:{user.pk}', f'author:{user.pk}')
         context['page_obj'] = get_page(self.request, posts, 10)
         return context
 
@@ -83,17 +164,8 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
                             kwargs={'username': self.request.user.username})
 
 
-class ChangePasswordView(LoginRequiredMixin, UpdateView):
-    model = User
-    template_name = 'blog/profile.html'
-
-    def form_valid(self, form):
-        return super().form_valid(form)
-
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['profile'] = self.request.user
-        return context
+class ChangePasswordView(LoginRequiredMixin, PasswordChangeView):
+    template_name = 'registration/password_change_form.html'
 
     def get_success_url(self):
         return reverse_lazy('blog:profile',
@@ -106,23 +178,27 @@ class PostDetailView(LoginRequiredMixin, DetailView):
     pk_url_kwarg = 'post_id'
 
     def get_object(self):
-        user = self.request.user
         post_id = self.kwargs.get('post_id')
-        post = get_object_or_404(get_all_posts(), pk=post_id)
-        if post and post.author == user:
-            return post
-        return get_object_or_404(get_published_posts(get_all_posts()),
-                                 pk=post_id)
+        post = cached(f'post:{post_id}', (f'post:{post_id}',),
+                      lambda: get_all_posts().filter(pk=post_id).first())
+        if post is None or (post.author_id != self.request.user.pk
+                            and not is_published(post)):
+            raise Http404
+        return post
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        comments = self.get_object().comment.select_related('author')
+        post = self.object
         context['form'] = CommentForm()
-        context['comments'] = comments
+        context['comments'] = cached(
+            f'comments:{post.pk}', (f'post:{post.pk}',),
+            lambda: list(exclude_deleted(
+                post.comment.select_related('author'), 'author__tombstone')))
         return context
 
 
-class PostCreateView(LoginRequiredMixin, CreateView):
+class PostCreateView(RateLimitMixin, LoginRequiredMixin, CreateView):
+    rate_limit = 'posts'
     model = Post
     template_name = 'blog/create.html'
     form_class = PostForm
@@ -167,31 +243,43 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
             return redirect('blog:post_detail', post_id=post_id)
         return super().dispatch(request, *args, **kwargs)
 
+    def get_queryset(self):
+        return get_all_posts()
+
+    def delete(self, request, *args, **kwargs):
+        if not settings.SOFT_DELETE:
+            return super().delete(request, *args, **kwargs)
+        self.object = self.get_object()
+        schedule_deletion(self.object)
+        return redirect(self.get_success_url())
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = PostForm(instance=self.object)
         return context
 
 
-class CategoryPostsView(ListView):
+class CategoryPostsView(FragmentMixin, ListView):
     template_name = 'blog/category.html'
     paginate_by = 10
 
     def get_queryset(self):
-        category = self.kwargs.get('category_slug')
-        queryset = get_published_posts(get_all_posts())
-        return queryset.filter(category__slug=category)
+        self.category = catalog.get_category(
+            self.kwargs.get('category_slug'))
+        if self.category is None:
+            raise Http404
+        scope = f'category:{self.category.pk}'
+        return get_feed(get_published_posts(get_all_posts()).filter(
+            category_id=self.category.pk), scope, scope)
 
     def get_context_data(self, **kwargs):
-        category = self.kwargs.get('category_slug')
         context = super().get_context_data(**kwargs)
-        context['category'] = get_object_or_404(Category,
-                                                slug=category,
-                                                is_published=True)
+        context['category'] = self.category
         return context
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
+class CommentCreateView(RateLimitMixin, LoginRequiredMixin, CreateView):
+    rate_limit = 'comments'
     model = Comment
     template_name = 'blog/comment.html'
     form_class = CommentForm
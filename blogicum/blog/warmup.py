@@ -0,0 +1,61 @@
+import time
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.urls import reverse
+
+from blog import catalog
+from blog.client import WSGIClient
+from blog.deletion import exclude_deleted
+from blog.models import Category, User
+
+PAGES = 3
+PROFILES = 20
+
+
+def get_host():
+    hosts = [host for host in settings.ALLOWED_HOSTS
+             if host != '*' and not host.startswith('.')]
+    return hosts[0] if hosts else 'localhost'
+
+
+def get_steps(pages=PAGES, profiles=PROFILES):
+    index = reverse('blog:index')
+    authors = (exclude_deleted(User.objects.filter(is_active=True),
+                               'tombstone')
+               .annotate(published=Count(
+                   'post', filter=Q(post__is_published=True)))
+               .filter(published__gt=0)
+               .order_by('-published', 'pk')
+               .values_list('username', flat=True)[:profiles])
+    return [
+        ('index', [f'{index}?page={page}' for page in range(1, pages + 1)]),
+        ('categories', [reverse('blog:category_posts', args=(slug,))
+                        for slug in catalog.get_published(Category, 'slug')]),
+        ('profiles', [reverse('blog:profile', args=(username,))
+                      for username in authors]),
+    ]
+
+
+def warm(client=None, pages=PAGES, profiles=PROFILES, progress=None):
+    """Requests the pages most visited after a deploy through the WSGI
+    handler, so that their feed pages are in the shared cache before real
+    traffic arrives.
+
+    Compiled templates, URL resolvers, the catalog and the local cache
+    tier are loaded too, but only in the calling process: the WSGI hook
+    (BLOGICUM_WARM_CACHES) warms them for the worker, the warm_caches
+    command only fills the shared cache.
+
+    Returns (step, pages requested, failed responses, seconds) per step.
+    """
+    client = client or WSGIClient(host=get_host())
+    results = []
+    for name, urls in get_steps(pages, profiles):
+        started = time.perf_counter()
+        failed = sum(client.get(url).status_code >= 400 for url in urls)
+        results.append((name, len(urls), failed,
+                        time.perf_counter() - started))
+        if progress is not None:
+            progress(*results[-1])
+    return results
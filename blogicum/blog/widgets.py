@@ -0,0 +1,45 @@
+from django import forms
+from django.urls import reverse
+
+from blog import autocomplete
+
+CHOICES_LIMIT = 50
+
+
+class AutocompleteSelect(forms.Select):
+    """Select that renders a bounded set of choices from the autocomplete
+    index plus the selected one, instead of every row of the table.
+
+    The script fetches other choices from the autocomplete endpoint.
+    """
+
+    class Media:
+        js = ('js/autocomplete.js',)
+
+    def __init__(self, kind, attrs=None, limit=CHOICES_LIMIT):
+        super().__init__(attrs)
+        self.kind = kind
+        self.limit = limit
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs']['data-autocomplete-url'] = reverse(
+            f'blog:autocomplete_{self.kind}')
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        index = autocomplete.INDEXES[self.kind]
+        selected = {int(item) for item in value if str(item).isdigit()}
+        choices = index.choices(self.limit)
+        missing = selected - {pk for pk, _ in choices}
+        if missing:
+            choices = list(
+                index.model._default_manager.filter(pk__in=missing)
+                .values_list('pk', index.field)) + choices
+        options = [('', '---------')] + choices
+        return [
+            (None, [self.create_option(
+                name, pk, label, pk in selected or (pk == '' and not selected),
+                position)], position)
+            for position, (pk, label) in enumerate(options)
+        ]
@@ -34,6 +34,18 @@ DEBUG = True
 
 ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
 
+# Raise blog.strict_templates.LazyRelationError when a template lazily
+# loads a foreign key instead of relying on select_related().
+STRICT_TEMPLATES = False
+
+# Autocomplete keeps tables up to this size in memory, larger ones are
+# looked up in the database.
+AUTOCOMPLETE_INDEX_SIZE = 100_000
+
+# Deleting posts and users marks them with a tombstone and hides them,
+# the purge_deleted command removes them in small batches later.
+SOFT_DELETE = False
+
 MEDIA_ROOT = BASE_DIR / 'media'
 
 # Application definition
@@ -52,6 +64,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.InvalidationMiddleware',
+    'blog.middleware.ConcurrencyLimitMiddleware',
+    'blog.middleware.StaleFallbackMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -94,6 +109,129 @@ DATABASES = {
 }
 
 
+# Hot entries (first feed pages, post pages) are served from a small
+# per-process LRU in front of the 'shared' cache, which all workers of a
+# node share. In production point 'shared' at Redis, e.g. with
+# 'django_redis.cache.RedisCache'. Its add() and incr() must be atomic:
+# feed recomputation takes locks with add() and rate limit buckets count
+# with incr(); AtomicFileBasedCache makes both atomic across the
+# processes of one node. Feed version stamps skip the local tier, so a
+# write on any worker invalidates the others' local copies; so do locks
+# and rate limit buckets. Saved copies of anonymous pages skip it too,
+# so that they do not push the hot entries out of the LRU. Once the file
+# cache holds MAX_ENTRIES pages it culls a random tenth of them, but
+# never the PINNED_PREFIXES keys: losing a lock lets two workers
+# recompute one entry, losing a bucket resets its limit. Redis evicts
+# without such distinction, so give it enough memory not to evict, or
+# keep 'shared' on a noeviction instance.
+CACHES = {
+    'default': {
+        'BACKEND': 'blog.cache.TwoTierCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'SHARED_PREFIXES': ['feed:version:', 'lock:', 'ratelimit:',
+                                'stale:'],
+            'MAX_ENTRIES': 1000,
+            'LOCAL_TIMEOUT': 60,
+        },
+    },
+    'shared': {
+        'BACKEND': 'blog.cache.AtomicFileBasedCache',
+        'LOCATION': BASE_DIR / 'cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10_000,
+            'CULL_FREQUENCY': 10,
+            'PINNED_PREFIXES': ['feed:version:', 'lock:', 'ratelimit:'],
+        },
+    },
+    'sessions': {
+        'BACKEND': 'blog.cache.CappedLocMemCache',
+        'LOCATION': 'sessions',
+        'TIMEOUT': 60,
+        'OPTIONS': {'MAX_ENTRIES': 10_000},
+    },
+}
+
+# Sessions live in the database behind a small per-process cache, so most
+# requests do not read django_session. A session changed on another
+# worker (e.g. by logging out) is seen here after at most the 'sessions'
+# cache TIMEOUT. For read-mostly deployments set SESSION_ENGINE to
+# 'django.contrib.sessions.backends.signed_cookies' to keep sessions in
+# the client and never query the database for them; such sessions cannot
+# be revoked on the server before they expire.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'sessions'
+
+# request.user and profile lookups come from a per-process cache of at
+# most USER_CACHE_SIZE users, each kept for USER_CACHE_TIMEOUT seconds.
+# ModelBackend stays listed for sessions created before the switch.
+AUTHENTICATION_BACKENDS = [
+    'blog.backends.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_SIZE = 10_000
+USER_CACHE_TIMEOUT = 60
+
+# Per-process caches (autocomplete indexes, categories and locations,
+# users) are invalidated on every worker through this bus. FileBus
+# reaches the workers of one node through a shared file; with several
+# nodes use a LocalBus subclass that broadcasts over e.g. Redis pub/sub.
+INVALIDATION_BUS = {
+    'BACKEND': 'blog.bus.FileBus',
+    'OPTIONS': {'path': BASE_DIR / 'cache' / 'invalidation.log'},
+}
+
+# Anonymous GET pages are served from a copy saved at most every
+# STALE_PAGE_REFRESH seconds when the database fails or a query takes
+# longer than DB_LATENCY_BUDGET seconds. After DB_BREAKER_FAILURES such
+# failures in a row a worker stops querying the database for
+# DB_BREAKER_COOLDOWN seconds.
+DB_LATENCY_BUDGET = 2
+DB_BREAKER_FAILURES = 5
+DB_BREAKER_COOLDOWN = 30
+STALE_PAGE_REFRESH = 60
+STALE_PAGE_TIMEOUT = 24 * 60 * 60
+
+# A worker serves at most CONCURRENCY_LIMIT requests at once, and at most
+# CONCURRENCY_LIMITS of each class: writes (POST and the like), media
+# (MEDIA_URL and STATIC_URL) and feeds (everything else). Up to
+# CONCURRENCY_QUEUE_SIZE requests over the limits wait for
+# CONCURRENCY_QUEUE_TIMEOUT seconds, the rest get 503 at once. Anonymous
+# pages with a saved copy are served from it instead of waiting. Live
+# numbers are at blog:concurrency_metrics for INTERNAL_IPS, which is not
+# limited.
+CONCURRENCY_LIMIT = 16
+CONCURRENCY_LIMITS = {'writes': 2, 'feeds': 12, 'media': 4}
+CONCURRENCY_QUEUE_SIZE = 32
+CONCURRENCY_QUEUE_TIMEOUT = 0.5
+CONCURRENCY_RETRY_AFTER = 1
+INTERNAL_IPS = ['127.0.0.1']
+
+# Token buckets for write views: at most `capacity` POST requests in a
+# burst, refilled evenly over `period` seconds, per user or, for
+# anonymous visitors, per IP address. Views whose bucket is missing
+# here are not limited.
+RATE_LIMITS = {
+    'comments': {'capacity': 10, 'period': 60},
+    'posts': {'capacity': 5, 'period': 300},
+    'registration': {'capacity': 3, 'period': 3600},
+}
+
+# Error pages pre-rendered by the render_error_pages command. Handlers
+# serve them from memory and render the templates only if they are
+# missing, so an error storm caused by the database does not query it.
+ERROR_PAGES_DIR = BASE_DIR / 'error_pages'
+
+# Published categories and locations are kept in a per-process map for
+# at most CATALOG_CACHE_TIMEOUT seconds.
+CATALOG_CACHE_TIMEOUT = 60
+
+# Cached feed pages are invalidated by version counters on writes, the
+# timeout only frees memory.
+FEED_CACHE_TIMEOUT = 600
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -17,7 +17,7 @@ from django.contrib import admin
 from django.urls import include, path
 from django.conf import settings
 from django.conf.urls.static import static
-from blog.views import RegistrationView
+from blog.views import OutboxPasswordResetView, RegistrationView
 
 handler403 = 'pages.views.handler403'
 handler404 = 'pages.views.handler404'
@@ -27,6 +27,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('blog.urls', namespace='blog')),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('auth/password_reset/', OutboxPasswordResetView.as_view(),
+         name='password_reset'),
     path('auth/', include('django.contrib.auth.urls')),
     path('auth/registration/', RegistrationView.as_view(),
          name='registration'),
@@ -14,3 +14,14 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
 application = get_wsgi_application()
+
+# Set BLOGICUM_WARM_CACHES=1 to load the most visited pages (see the
+# warm_caches command) before the worker accepts requests. Unlike the
+# command, this also warms the worker's own templates, URL resolvers
+# and in-process caches. With a preloading server this runs once,
+# before the workers are forked.
+if os.environ.get('BLOGICUM_WARM_CACHES'):
+    from blog.client import WSGIClient
+    from blog.warmup import get_host, warm
+
+    warm(WSGIClient(application, host=get_host()))
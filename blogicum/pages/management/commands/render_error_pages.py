@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pages.views import ERROR_TEMPLATES, PRERENDERED, prerender
+
+
+class Command(BaseCommand):
+    help = ('Заранее отрисовывает страницы ошибок в HTML-файлы, чтобы '
+            'обработчики ошибок отдавали их из памяти, не обращаясь к базе '
+            'данных. Запускайте при выкладке, до старта рабочих процессов.')
+
+    def handle(self, *args, **options):
+        directory = settings.ERROR_PAGES_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        for status in ERROR_TEMPLATES:
+            path = directory / f'{status}.html'
+            path.write_text(prerender(status), encoding='utf-8')
+            self.stdout.write(f'{status}: {path}')
+        PRERENDERED.clear()
+        self.stdout.write(self.style.SUCCESS('Страницы ошибок готовы.'))
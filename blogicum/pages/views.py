@@ -1,20 +1,66 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.html import escape
 from django.views.generic import TemplateView
 
+ERROR_TEMPLATES = {
+    403: 'pages/403csrf.html',
+    404: 'pages/404.html',
+    500: 'pages/500.html',
+}
+# Stands for the address of the missing page in the pre-rendered 404.
+URL_PLACEHOLDER = '__REQUEST_URL__'
+PRERENDERED = {}
+
+
+class PlaceholderRequest(HttpRequest):
+    def build_absolute_uri(self, location=None):
+        return URL_PLACEHOLDER
+
+
+def prerender(status):
+    """Renders the error page for an anonymous visitor without a request,
+    see the render_error_pages command.
+    """
+    request = PlaceholderRequest()
+    request.method = 'GET'
+    request.user = AnonymousUser()
+    return render_to_string(ERROR_TEMPLATES[status], request=request)
+
+
+def get_prerendered(status):
+    # Read once per process; a missing file is remembered too.
+    if status not in PRERENDERED:
+        path = settings.ERROR_PAGES_DIR / f'{status}.html'
+        try:
+            PRERENDERED[status] = path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            PRERENDERED[status] = None
+    return PRERENDERED[status]
+
+
+def render_error(request, status):
+    html = get_prerendered(status)
+    if html is None:
+        return render(request, ERROR_TEMPLATES[status], status=status)
+    html = html.replace(URL_PLACEHOLDER,
+                        escape(request.build_absolute_uri()))
+    return HttpResponse(html, status=status)
+
 
 def handler403(request, exception):
-    template = 'pages/403csrf.html'
-    return render(request, template, status=403)
+    return render_error(request, 403)
 
 
 def handler404(request, exception):
-    template = 'pages/404.html'
-    return render(request, template, status=404)
+    return render_error(request, 404)
 
 
 def handler500(request):
-    template = 'pages/500.html'
-    return render(request, template, status=500)
+    return render_error(request, 500)
 
 
 class AboutView(TemplateView):
@@ -0,0 +1,30 @@
+document.querySelectorAll('select[data-autocomplete-url]').forEach((select) => {
+  const input = document.createElement('input');
+  input.type = 'search';
+  input.className = 'form-control mb-1';
+  input.placeholder = 'Начните вводить название';
+  select.before(input);
+  let timer;
+  input.addEventListener('input', () => {
+    clearTimeout(timer);
+    timer = setTimeout(async () => {
+      const query = input.value.trim();
+      if (!query) {
+        return;
+      }
+      const url = `${select.dataset.autocompleteUrl}?q=${encodeURIComponent(query)}`;
+      const { results } = await (await fetch(url)).json();
+      const selected = select.value;
+      for (const option of [...select.options]) {
+        if (option.value && option.value !== selected) {
+          option.remove();
+        }
+      }
+      for (const { id, text } of results) {
+        if (String(id) !== selected) {
+          select.add(new Option(text, id));
+        }
+      }
+    }, 250);
+  });
+});
@@ -1,6 +1,7 @@
 import os
 import re
 import time
+from datetime import timedelta
 from http import HTTPStatus
 from inspect import getsource
 from pathlib import Path
@@ -19,11 +20,13 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -41,6 +44,52 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope="session", autouse=True)
+def enable_strict_templates():
+    from blog import strict_templates
+    strict_templates.enable()
+    yield
+    strict_templates.disable()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def local_cache_and_bus():
+    from django.conf import settings
+
+    from blog import bus
+
+    cache_settings = {
+        **settings.CACHES,
+        "shared": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "shared",
+        },
+    }
+    with override_settings(
+        CACHES=cache_settings,
+        INVALIDATION_BUS={"BACKEND": "blog.bus.LocalBus"},
+    ):
+        bus.get_bus.cache_clear()
+        yield
+    bus.get_bus.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    from blog import autocomplete, catalog, users
+
+    def clear():
+        autocomplete.clear()
+        catalog.clear()
+        users.clear()
+        for cache in caches.all():
+            cache.clear()
+
+    clear()
+    yield
+    clear()
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -114,6 +163,28 @@ def another_user(mixer):
     return mixer.blend(User)
 
 
+@pytest.fixture
+def blend_post(mixer, user, published_category):
+    """Returns a function that blends a post of `user` shown in the
+    feeds since yesterday; keyword arguments override its fields."""
+    def blend(**kwargs):
+        params = {
+            "author": user,
+            "category": published_category,
+            "location": None,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+        }
+        params.update(kwargs)
+        return mixer.blend("blog.Post", **params)
+    return blend
+
+
+@pytest.fixture
+def published_post(blend_post):
+    return blend_post()
+
+
 @pytest.fixture
 def user_client(user):
     client = Client()
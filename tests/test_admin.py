@@ -0,0 +1,75 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import users
+from blog.admin import EstimatedCountPaginator
+from blog.models import Category, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_changelist_queries(admin_client, url):
+    users.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return len(queries)
+
+
+@pytest.mark.parametrize('url', ['/admin/blog/post/', '/admin/blog/comment/'])
+def test_changelist_queries_do_not_grow(admin_client, mixer, url):
+    def blend(size):
+        posts = mixer.cycle(size).blend('blog.Post')
+        mixer.cycle(size).blend('blog.Comment', post=mixer.sequence(*posts))
+
+    blend(2)
+    small = count_changelist_queries(admin_client, url)
+    blend(20)
+    large = count_changelist_queries(admin_client, url)
+    assert small == large, (
+        f'Число запросов на `{url}` растёт вместе с данными: '
+        f'{small} -> {large}.'
+    )
+
+
+def test_publish_actions_update_in_bulk(admin_client, mixer):
+    posts = mixer.cycle(3).blend('blog.Post', is_published=False)
+    with CaptureQueriesContext(connection) as queries:
+        admin_client.post('/admin/blog/post/', {
+            'action': 'publish',
+            '_selected_action': [post.id for post in posts],
+        })
+    updates = [query for query in queries
+               if query['sql'].startswith('UPDATE "blog_post"')]
+    assert len(updates) == 1
+    assert not [query for query in queries
+                if query['sql'].startswith('SELECT "blog_post"."id"')], (
+        'Убедитесь, что действие не загружает ключи выбранных записей.'
+    )
+    assert Post.objects.filter(is_published=True).count() == 3
+
+
+def test_publish_actions_invalidate_autocomplete(admin_client, client, mixer):
+    category = mixer.blend('blog.Category', title='Кино', is_published=True)
+    response = client.get('/autocomplete/categories/', {'q': 'ки'})
+    assert response.json()['results'] == [{'id': category.id, 'text': 'Кино'}]
+    admin_client.post('/admin/blog/category/', {
+        'action': 'unpublish', '_selected_action': [category.id],
+    })
+    response = client.get('/autocomplete/categories/', {'q': 'ки'})
+    assert response.json()['results'] == [], (
+        'Убедитесь, что массовое снятие с публикации сбрасывает кеш '
+        'автодополнения.'
+    )
+
+
+def test_paginator_caps_count(mixer):
+    mixer.cycle(5).blend('blog.Category', is_published=False)
+    paginator = EstimatedCountPaginator(
+        Category.objects.filter(is_published=False), 2)
+    paginator.count_limit = 3
+    assert paginator.count == 3
+    paginator = EstimatedCountPaginator(Category.objects.all(), 2)
+    paginator.count_limit = 3
+    assert paginator.count >= 5
@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from blog.autocomplete import INDEXES
+
+pytestmark = [pytest.mark.django_db]
+
+
+def complete(client, kind, query):
+    response = client.get(f'/autocomplete/{kind}/', {'q': query})
+    assert response.status_code == 200
+    return [item['text'] for item in response.json()['results']]
+
+
+def test_autocomplete_matches_prefix_case_insensitively(client, mixer):
+    for title in ('Путешествия', 'путь домой', 'Пульс', 'Кино'):
+        mixer.blend('blog.Category', title=title, is_published=True)
+    mixer.blend('blog.Category', title='Пустое', is_published=False)
+    assert complete(client, 'categories', 'пут') == [
+        'Путешествия', 'путь домой'
+    ], (
+        'Убедитесь, что автодополнение ищет опубликованные категории по '
+        'началу названия без учёта регистра.'
+    )
+    assert complete(client, 'categories', '') == []
+
+
+def test_autocomplete_is_served_from_memory(client, mixer):
+    mixer.blend('blog.Location', name='Москва', is_published=True)
+    complete(client, 'locations', 'мо')
+    with CaptureQueriesContext(connection) as queries:
+        assert complete(client, 'locations', 'мос') == ['Москва']
+    assert not queries, (
+        'Убедитесь, что повторные запросы автодополнения не обращаются к БД.'
+    )
+
+
+def test_autocomplete_follows_changes(client, mixer):
+    location = mixer.blend('blog.Location', name='Москва', is_published=True)
+    assert complete(client, 'locations', 'мо') == ['Москва']
+    location.name = 'Мурманск'
+    location.save()
+    other = mixer.blend('blog.Location', name='Мытищи', is_published=True)
+    assert complete(client, 'locations', 'м') == ['Мурманск', 'Мытищи']
+    location.is_published = False
+    location.save()
+    other.delete()
+    assert complete(client, 'locations', 'м') == [], (
+        'Убедитесь, что индекс автодополнения обновляется при изменении '
+        'и удалении объектов.'
+    )
+
+
+def test_autocomplete_falls_back_to_database(client, mixer):
+    for username in ('anna', 'Andrew', 'boris'):
+        mixer.blend('auth.User', username=username)
+    with override_settings(AUTOCOMPLETE_INDEX_SIZE=2):
+        with CaptureQueriesContext(connection) as queries:
+            assert complete(client, 'users', 'an') == ['Andrew', 'anna']
+    assert any('FROM "auth_user"' in query['sql'] and 'LIMIT' in query['sql']
+               and '>=' in query['sql'] for query in queries), (
+        'Убедитесь, что для больших таблиц автодополнение ищет в БД.'
+    )
+
+
+def test_database_fallback_folds_cyrillic_case(client, mixer):
+    for name in ('Река', 'Ручей', 'Озеро'):
+        mixer.blend('blog.Location', name=name, is_published=True)
+    with override_settings(AUTOCOMPLETE_INDEX_SIZE=1):
+        assert complete(client, 'locations', 'р') == ['Река', 'Ручей'], (
+            'Убедитесь, что поиск в БД, как и в памяти, не учитывает '
+            'регистр кириллицы.'
+        )
+        assert complete(client, 'locations', 'РУ') == ['Ручей']
+
+
+@pytest.mark.parametrize('kind', ['users', 'categories', 'locations'])
+def test_database_fallback_seeks_index(mixer, kind):
+    if connection.vendor != 'sqlite':
+        pytest.skip('План запроса проверяется на SQLite.')
+    index = INDEXES[kind]
+    mixer.cycle(2).blend(index.model, **index.filters)
+    queries = []
+
+    def explain(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with override_settings(AUTOCOMPLETE_INDEX_SIZE=0):
+        with connection.execute_wrapper(explain):
+            index.search('an')
+    sql, params = queries[-1]
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+    assert 'SEARCH' in plan and '_casefold' in plan, (
+        f'Убедитесь, что поиск по префиксу в БД использует индекс: {plan}'
+    )
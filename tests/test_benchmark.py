@@ -0,0 +1,52 @@
+import json
+from io import StringIO
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.core.management import call_command
+
+from blog.client import WSGIClient
+from blog.management.commands.benchmark_views import compare, summarize
+
+
+@pytest.mark.django_db
+def test_wsgi_client_posts_comment(user, post_with_published_location):
+    client = WSGIClient()
+    client.login(user)
+    url = f'/posts/{post_with_published_location.id}/'
+    assert client.get(url).status_code == HTTPStatus.OK
+    response = client.post(f'{url}comment/', {'text': 'Текст'})
+    assert response.status_code == HTTPStatus.FOUND, (
+        'Убедитесь, что комментарий создаётся через WSGI-обработчик.'
+    )
+    assert post_with_published_location.comment.count() == 1
+
+
+def test_summarize_and_compare():
+    stats = summarize([0.01] * 9 + [0.1], elapsed=1)
+    assert stats['p50_ms'] == pytest.approx(10)
+    assert stats['p99_ms'] == pytest.approx(100)
+    assert stats['rps'] == 10
+    baseline = {'paths': {'index': {'p90_ms': 10}}}
+    assert compare({'paths': {'index': {'p90_ms': 11}}}, baseline, 0.2) == []
+    assert compare({'paths': {'index': {'p90_ms': 13}}}, baseline, 0.2) == [
+        ('index', 10, 13)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_runs_end_to_end(tmp_path):
+    output = tmp_path / 'results.json'
+    call_command('benchmark_views', users=2, categories=1, locations=1,
+                 posts=5, comments=5, requests=12, warmup=1,
+                 output=str(output), stdout=StringIO())
+    results = json.loads(output.read_text(encoding='utf-8'))
+    assert set(results['paths']) == {
+        'index', 'category', 'profile', 'detail', 'comment_create'}, (
+        'Убедитесь, что бенчмарк проходит все страницы, не упираясь в '
+        'ограничение частоты запросов.'
+    )
+    assert not caches['shared']._cache, (
+        'Убедитесь, что бенчмарк не оставляет данных в кеше сайта.'
+    )
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from blog import bus, catalog
+from blog.models import Category
+
+
+@pytest.fixture
+def events(monkeypatch):
+    received = []
+    monkeypatch.setitem(bus.HANDLERS, 'test',
+                        [lambda **data: received.append(data)])
+    monkeypatch.setitem(bus.HANDLERS, 'reset',
+                        [lambda: received.append('reset')])
+    return received
+
+
+@pytest.mark.django_db
+def test_file_bus_reaches_other_workers(
+        tmp_path, events, django_capture_on_commit_callbacks):
+    path = tmp_path / 'invalidation.log'
+    worker, other = bus.FileBus(path, 0), bus.FileBus(path, 0)
+    with django_capture_on_commit_callbacks(execute=True):
+        worker.publish('test', pk=1)
+        other.poll()
+        assert events == [{'pk': 1}], (
+            'Убедитесь, что событие рассылается после фиксации транзакции.'
+        )
+    worker.poll()
+    assert events == [{'pk': 1}], (
+        'Убедитесь, что обработчик не получает собственные события дважды.'
+    )
+    other.poll()
+    assert events == [{'pk': 1}, {'pk': 1}]
+    other.poll()
+    assert len(events) == 2
+
+
+@pytest.mark.django_db
+def test_rotated_file_resets_caches(
+        tmp_path, events, django_capture_on_commit_callbacks):
+    path = tmp_path / 'invalidation.log'
+    worker = bus.FileBus(path, 0, max_size=100)
+    other = bus.FileBus(path, 0)
+    with django_capture_on_commit_callbacks(execute=True):
+        worker.publish('test', pk=1)
+    other.poll()
+    with django_capture_on_commit_callbacks(execute=True):
+        worker.publish('test', pk=2)
+        worker.publish('test', pk=3)
+    events.clear()
+    other.poll()
+    assert events == ['reset', {'pk': 3}], (
+        'Убедитесь, что после ротации файла событий кеши сбрасываются.'
+    )
+
+
+@pytest.mark.django_db
+def test_edit_on_other_worker_evicts_catalog(
+        monkeypatch, tmp_path, client, published_category):
+    path = tmp_path / 'invalidation.log'
+    worker = bus.FileBus(path, 0)
+    monkeypatch.setattr(bus, 'get_bus', lambda: worker)
+    url = f'/category/{published_category.slug}/'
+    assert client.get(url).status_code == 200
+    # Another worker unpublishes the category.
+    Category.objects.filter(pk=published_category.pk).update(
+        is_published=False)
+    bus.FileBus(path).write(json.dumps({
+        'sender': 'other', 'topic': 'catalog',
+        'data': {'model': 'blog.Category'},
+    }) + '\n')
+    assert catalog.get_category(published_category.slug) is not None
+    assert client.get(url).status_code == 404, (
+        'Убедитесь, что события других процессов сбрасывают кеш категорий.'
+    )
@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def post(blend_post, published_location):
+    return blend_post(location=published_location)
+
+
+def catalog_queries(client, url, expected_status=200):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == expected_status
+    return [query for query in queries
+            if 'FROM "blog_category"' in query['sql']
+            or 'FROM "blog_location"' in query['sql']]
+
+
+def test_category_page_uses_catalog(client, post):
+    url = f'/category/{post.category.slug}/'
+    catalog_queries(client, url)
+    assert not catalog_queries(client, url), (
+        'Убедитесь, что категория берётся из кеша опубликованных категорий.'
+    )
+    assert not catalog_queries(client, '/category/missing/', 404)
+
+
+def test_catalog_follows_changes(client, post):
+    url = f'/category/{post.category.slug}/'
+    catalog_queries(client, url)
+    post.category.is_published = False
+    post.category.save()
+    catalog_queries(client, url, 404)
+
+
+def test_post_card_location_from_catalog(client, post):
+    content = client.get('/').content.decode()
+    assert post.location.name in content
+    post.location.is_published = False
+    post.location.save()
+    content = client.get('/').content.decode()
+    assert post.location.name not in content
+    assert 'Планета Земля' in content
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+from django.test import Client, override_settings
+
+from blog import concurrency
+from blog.concurrency import ConcurrencyLimiter
+from blog.middleware import STALE_WARNING
+
+
+@pytest.fixture
+def limits():
+    def apply(**limits):
+        concurrency.get_limiter.cache_clear()
+        return override_settings(CONCURRENCY_LIMITS={
+            'writes': 2, 'feeds': 12, 'media': 4, **limits},
+            CONCURRENCY_QUEUE_TIMEOUT=0.01)
+
+    yield apply
+    concurrency.get_limiter.cache_clear()
+
+
+def test_limiter_queues_then_rejects():
+    limiter = ConcurrencyLimiter(2, {'writes': 1, 'feeds': 2}, 1, 0.01)
+    assert limiter.acquire('writes')
+    assert not limiter.acquire('writes', wait=False)
+    assert not limiter.acquire('writes'), (
+        'Убедитесь, что запрос сверх лимита ждёт недолго и получает отказ.'
+    )
+    assert limiter.acquire('feeds')
+    assert not limiter.acquire('feeds', wait=False), (
+        'Убедитесь, что учитывается общий лимит процесса.'
+    )
+    limiter.release('writes')
+    assert limiter.acquire('feeds')
+
+
+def test_waiting_request_gets_released_slot():
+    limiter = ConcurrencyLimiter(1, {'feeds': 1}, 1, 5)
+    limiter.acquire('feeds')
+    threading.Timer(0.05, limiter.release, ('feeds',)).start()
+    started = time.monotonic()
+    assert limiter.acquire('feeds')
+    assert time.monotonic() - started < 5
+    snapshot = limiter.snapshot()
+    assert snapshot['in_flight'] == 1
+    assert snapshot['classes']['feeds']['served'] == 2
+
+
+@pytest.mark.django_db
+def test_requests_over_limit_get_503(limits, user_client, published_post):
+    post = published_post
+    client = Client()
+    client.get('/')
+    with limits(writes=0, feeds=0):
+        stale = client.get('/')
+        page = user_client.get('/')
+        comment = user_client.post(f'/posts/{post.id}/comment/',
+                                   {'text': 'Текст'})
+        metrics = client.get('/metrics/concurrency/')
+    assert stale.status_code == 200
+    assert stale['Warning'] == STALE_WARNING, (
+        'Убедитесь, что анонимная страница из кеша отдаётся без очереди.'
+    )
+    for response in (page, comment):
+        assert response.status_code == 503
+        assert response['Retry-After'] == '1'
+    assert not post.comment.exists()
+    assert metrics.status_code == 200, (
+        'Убедитесь, что метрики доступны и при исчерпанных лимитах.'
+    )
+    assert metrics.json()['classes']['feeds']['rejected'] == 1
+
+
+@pytest.mark.django_db
+def test_metrics_are_internal(client):
+    response = client.get('/metrics/concurrency/', REMOTE_ADDR='10.0.0.1')
+    assert response.status_code == 403
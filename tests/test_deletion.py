@@ -0,0 +1,92 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.deletion import schedule_deletion
+from blog.models import Comment, Post, Tombstone, User
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def soft_delete():
+    with override_settings(SOFT_DELETE=True):
+        yield
+
+
+def purge(batch_size=2):
+    call_command('purge_deleted', batch_size=batch_size, stdout=StringIO())
+
+
+def test_deleted_post_is_hidden_until_purge(user_client, client, mixer,
+                                            published_post):
+    post = published_post
+    mixer.cycle(5).blend('blog.Comment', post=post)
+    response = user_client.post(f'/posts/{post.id}/delete/')
+    assert response.status_code == 302
+    assert Post.objects.filter(pk=post.id).exists(), (
+        'Убедитесь, что в режиме SOFT_DELETE публикация удаляется в фоне.'
+    )
+    assert client.get(f'/posts/{post.id}/').status_code in (302, 404)
+    assert user_client.get(f'/posts/{post.id}/').status_code == 404
+    assert post not in client.get('/').context['page_obj']
+    with CaptureQueriesContext(connection) as queries:
+        purge()
+    comment_deletes = [
+        query for query in queries
+        if query['sql'].startswith('DELETE FROM "blog_comment"')
+    ]
+    assert len(comment_deletes) >= 3, (
+        'Убедитесь, что комментарии удаляются пакетами.'
+    )
+    assert not Post.objects.filter(pk=post.id).exists()
+    assert not Comment.objects.exists()
+    assert not Tombstone.objects.exists()
+
+
+def test_deleted_user_is_hidden_until_purge(client, user, mixer,
+                                            published_post):
+    post = published_post
+    other_post = mixer.blend('blog.Post')
+    mixer.cycle(3).blend('blog.Comment', post=other_post, author=user)
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    schedule_deletion(user)
+    assert client.get(f'/profile/{user.username}/').status_code == 404
+    assert not client.login(username=user.username, password='')
+    purge()
+    assert not User.objects.filter(pk=user.pk).exists()
+    assert not Post.objects.filter(author=user).exists()
+    assert not Comment.objects.filter(post=post).exists()
+    assert not Comment.objects.filter(author=user).exists()
+    assert Post.objects.filter(pk=other_post.pk).exists()
+
+
+def test_admin_schedules_deletion(admin_client, user, mixer,
+                                  published_post):
+    post = published_post
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    with CaptureQueriesContext(connection) as queries:
+        confirm = admin_client.get(f'/admin/blog/post/{post.id}/delete/')
+        response = admin_client.post(f'/admin/blog/post/{post.id}/delete/',
+                                     {'post': 'yes'})
+    assert confirm.status_code == 200
+    assert response.status_code == 302
+    assert not [query for query in queries
+                if 'blog_comment' in query['sql']], (
+        'Убедитесь, что в режиме SOFT_DELETE админка не удаляет связанные '
+        'объекты в запросе.'
+    )
+    assert Tombstone.objects.filter(post=post).exists()
+    admin_client.post('/admin/auth/user/', {
+        'action': 'delete_selected', '_selected_action': [user.id],
+        'post': 'yes',
+    })
+    user.refresh_from_db()
+    assert not user.is_active
+    assert Tombstone.objects.filter(user=user).exists()
+    purge()
+    assert not User.objects.filter(pk=user.pk).exists()
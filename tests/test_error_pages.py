@@ -0,0 +1,39 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from pages.views import PRERENDERED
+
+
+@pytest.fixture
+def error_pages(tmp_path):
+    PRERENDERED.clear()
+    with override_settings(ERROR_PAGES_DIR=tmp_path):
+        call_command('render_error_pages', stdout=StringIO())
+        yield tmp_path
+    PRERENDERED.clear()
+
+
+@pytest.mark.django_db
+def test_prerendered_404_skips_database(error_pages, user_client):
+    assert (error_pages / '404.html').is_file()
+    user_client.get('/')
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get('/missing/page/')
+    assert response.status_code == 404
+    assert 'http://testserver/missing/page/' in response.content.decode()
+    assert not response.templates, (
+        'Убедитесь, что страница 404 берётся из заранее отрисованного файла.'
+    )
+    assert not [query for query in queries
+                if 'django_session' not in query['sql']]
+
+
+def test_prerendered_pages_are_anonymous(error_pages):
+    html = (error_pages / '500.html').read_text(encoding='utf-8')
+    assert 'На сервере что-то пошло не так!' in html
+    assert 'Выйти' not in html
@@ -0,0 +1,47 @@
+import csv
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.http import StreamingHttpResponse
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_profile_export_for_owner(
+        user, user_client, post_with_published_location, comment_to_a_post):
+    url = f'/profile/{user.username}/?export=jsonl'
+    response = user_client.get(url)
+    assert isinstance(response, StreamingHttpResponse), (
+        'Убедитесь, что выгрузка профиля отдаётся потоком.'
+    )
+    rows = [json.loads(line) for line in
+            b''.join(response.streaming_content).decode().splitlines()]
+    assert rows[0]['type'] == 'post'
+    assert rows[0]['title'] == post_with_published_location.title
+    assert rows[0]['author'] == user.username
+
+
+def test_profile_export_csv(user, user_client, post_with_published_location):
+    response = user_client.get(f'/profile/{user.username}/?export=csv')
+    content = b''.join(response.streaming_content).decode()
+    rows = list(csv.DictReader(StringIO(content)))
+    assert [row['id'] for row in rows] == [
+        str(post_with_published_location.id)
+    ]
+
+
+def test_profile_export_only_for_owner(
+        user, another_user_client, unlogged_client):
+    url = f'/profile/{user.username}/?export=jsonl'
+    for client in (another_user_client, unlogged_client):
+        assert client.get(url).status_code == HTTPStatus.FORBIDDEN
+
+
+def test_export_blog_command(post_with_published_location, comment_to_a_post):
+    out = StringIO()
+    call_command('export_blog', chunk_size=1, stdout=out)
+    kinds = [json.loads(line)['type'] for line in out.getvalue().splitlines()]
+    assert kinds == ['post', 'comment']
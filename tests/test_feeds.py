@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_feed(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    return [post.id for post in response.context['page_obj']], queries
+
+
+@pytest.mark.parametrize('url', ['/', '/category/{slug}/',
+                                 '/profile/{username}/'])
+def test_warm_feed_runs_one_query(client, blend_post, user, url):
+    post = blend_post()
+    url = url.format(slug=post.category.slug, username=user.username)
+    get_feed(client, url)
+    posts, queries = get_feed(client, url)
+    assert posts == [post.id]
+    assert len(queries) == 1, (
+        'Убедитесь, что повторный запрос ленты берёт публикации из кеша и '
+        'запрашивает только число комментариев.'
+    )
+
+
+def test_feed_follows_writes(client, blend_post, mixer):
+    post = blend_post()
+    assert get_feed(client, '/')[0] == [post.id]
+    mixer.blend('blog.Comment', post=post)
+    assert 'Комментарии (1)' in client.get('/').content.decode()
+    other = blend_post()
+    assert get_feed(client, '/')[0] == [other.id, post.id]
+    post.is_published = False
+    post.save()
+    assert get_feed(client, '/')[0] == [other.id]
+
+
+def test_write_bumps_only_affected_scopes(client, blend_post, mixer):
+    post = blend_post()
+    other_category = mixer.blend('blog.Category', is_published=True)
+    url = f'/category/{post.category.slug}/'
+    get_feed(client, url)
+    blend_post(category=other_category)
+    assert len(get_feed(client, url)[1]) == 1, (
+        'Убедитесь, что публикация в другой категории не сбрасывает кеш '
+        'ленты категории.'
+    )
+    post.category = other_category
+    post.save()
+    assert get_feed(client, url)[0] == [], (
+        'Убедитесь, что перенос публикации сбрасывает кеш старой категории.'
+    )
+
+
+def test_user_saves_bump_feeds_only_on_rename(client, blend_post, mixer):
+    post = blend_post()
+    get_feed(client, '/')
+    user = mixer.blend('auth.User')
+    user.set_password('новый пароль')
+    user.save()
+    assert len(get_feed(client, '/')[1]) == 1, (
+        'Убедитесь, что регистрация и смена пароля не сбрасывают кеш лент.'
+    )
+    post.author.username = 'renamed'
+    post.author.save()
+    assert len(get_feed(client, '/')[1]) > 1, (
+        'Убедитесь, что смена имени автора сбрасывает кеш лент.'
+    )
+
+
+def test_scheduled_post_appears_on_time(client, blend_post, monkeypatch):
+    now = timezone.now()
+    published = blend_post()
+    scheduled = blend_post(pub_date=now + timedelta(hours=1))
+    assert get_feed(client, '/')[0] == [published.id]
+    monkeypatch.setattr(timezone, 'now', lambda: now + timedelta(hours=2))
+    assert get_feed(client, '/')[0] == [scheduled.id, published.id], (
+        'Убедитесь, что отложенная публикация появляется в ленте в срок.'
+    )
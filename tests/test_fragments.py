@@ -0,0 +1,50 @@
+import pytest
+from django.test import RequestFactory
+
+from blog.fragments import FRAGMENT_MEDIA_TYPE
+from blog.middleware import stale_key
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def posts(blend_post):
+    return [blend_post() for _ in range(12)]
+
+
+@pytest.mark.parametrize('headers', [
+    {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'},
+    {'HTTP_ACCEPT': FRAGMENT_MEDIA_TYPE},
+])
+@pytest.mark.parametrize('url', ['/', '/category/{slug}/',
+                                 '/profile/{username}/'])
+def test_fragment_contains_only_post_cards(client, posts, user, url,
+                                           headers):
+    url = url.format(slug=posts[0].category.slug, username=user.username)
+    response = client.get(url, **headers)
+    assert response.status_code == 200
+    content = response.content.decode()
+    assert '<html' not in content, (
+        'Убедитесь, что во фрагменте нет базового шаблона страницы.'
+    )
+    assert content.count('<article') == 10
+    assert response['X-Next-Cursor'] == '2'
+    assert 'Accept' in response['Vary']
+    response = client.get(f'{url}?page=2', **headers)
+    assert response.content.decode().count('<article') == 2
+    assert 'X-Next-Cursor' not in response
+
+
+def test_full_page_is_unchanged(client, posts):
+    response = client.get('/')
+    content = response.content.decode()
+    assert '<html' in content
+    assert content.count('<article') == 10
+    assert 'X-Next-Cursor' not in response
+
+
+def test_fragments_have_own_stale_copies():
+    factory = RequestFactory()
+    page = factory.get('/')
+    fragment = factory.get('/', HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+    assert stale_key(page) != stale_key(fragment)
@@ -0,0 +1,82 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from blog.importing import iter_records
+from blog.models import Category, Post
+
+pytestmark = [pytest.mark.django_db]
+
+RECORDS = [
+    {'model': 'auth.user', 'pk': 7, 'fields': {
+        'username': 'writer', 'password': '!', 'groups': [],
+        'user_permissions': [], 'date_joined': '2022-12-18T22:57:29Z'}},
+    {'model': 'blog.category', 'pk': 3, 'fields': {
+        'title': 'Путешествия', 'slug': 'travel', 'description': 'Дороги',
+        'is_published': True, 'created_at': '2022-12-18T23:03:52Z'}},
+    {'model': 'admin.logentry', 'pk': 1, 'fields': {}},
+] + [
+    {'model': 'blog.post', 'pk': pk, 'fields': {
+        'title': f'Пост {pk}', 'text': 'Текст', 'author': 7, 'category': 3,
+        'location': None, 'pub_date': '2022-12-19T00:00:00Z',
+        'is_published': True, 'created_at': '2022-12-18T23:06:18Z'}}
+    for pk in range(1, 6)
+]
+
+
+def write_dump(tmp_path, records, jsonl=False, name='dump'):
+    path = tmp_path / (f'{name}.jsonl' if jsonl else f'{name}.json')
+    if jsonl:
+        path.write_text('\n'.join(json.dumps(r) for r in records))
+    else:
+        path.write_text(json.dumps(records, indent=2))
+    return str(path)
+
+
+@pytest.mark.parametrize('jsonl', [False, True])
+def test_iter_records_streams_small_chunks(tmp_path, jsonl):
+    with open(write_dump(tmp_path, RECORDS, jsonl)) as file:
+        assert list(iter_records(file, chunk_size=7)) == RECORDS
+
+
+@pytest.mark.parametrize('jsonl', [False, True])
+def test_import_blog(tmp_path, jsonl):
+    call_command('import_blog', write_dump(tmp_path, RECORDS, jsonl),
+                 batch_size=2, stdout=StringIO())
+    assert Post.objects.count() == 5
+    assert Category.objects.get(pk=3).created_at.year == 2022, (
+        'Убедитесь, что при загрузке сохраняются даты из дампа.'
+    )
+
+
+def test_import_blog_in_dumpdata_order(tmp_path):
+    # dumpdata lists apps alphabetically: blog.post comes before auth.user.
+    dump = write_dump(tmp_path, RECORDS[3:] + RECORDS[2:3] + RECORDS[:2])
+    call_command('import_blog', dump, batch_size=2, stdout=StringIO())
+    assert Post.objects.count() == 5, (
+        'Убедитесь, что дамп загружается при любом порядке моделей, '
+        'например как в выводе dumpdata.'
+    )
+
+
+def test_import_blog_checks_references(tmp_path):
+    dump = write_dump(tmp_path, RECORDS[1:])
+    with pytest.raises(CommandError):
+        call_command('import_blog', dump, stdout=StringIO())
+    assert not Post.objects.exists()
+
+
+def test_import_blog_resume(tmp_path):
+    dump = write_dump(tmp_path, RECORDS)
+    broken = write_dump(tmp_path, RECORDS[:5] + [
+        dict(RECORDS[5], fields=dict(RECORDS[5]['fields'], author=99))
+    ] + RECORDS[6:], name='broken')
+    with pytest.raises(CommandError):
+        call_command('import_blog', broken, batch_size=2, stdout=StringIO())
+    assert Post.objects.count() == 2
+    call_command('import_blog', dump, batch_size=2, resume=True,
+                 checkpoint=f'{broken}.checkpoint', stdout=StringIO())
+    assert sorted(Post.objects.values_list('pk', flat=True)) == [1, 2, 3, 4, 5]
@@ -0,0 +1,121 @@
+import smtplib
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from blog import outbox
+from blog.models import OutboxMessage
+
+pytestmark = [pytest.mark.django_db]
+
+
+class FlakyBackend(EmailBackend):
+    def send_messages(self, messages):
+        if any('broken' in address for message in messages
+               for address in message.to):
+            raise smtplib.SMTPRecipientsRefused({})
+        return super().send_messages(messages)
+
+
+class ReconnectFailsBackend(FlakyBackend):
+    # The server goes away after the first failed message.
+    down = False
+
+    def open(self):
+        if self.down:
+            raise ConnectionRefusedError('Connection refused')
+
+    def close(self):
+        self.down = True
+
+
+class DownBackend(EmailBackend):
+    def open(self):
+        raise ConnectionRefusedError('Connection refused')
+
+
+def enqueue(to):
+    return outbox.enqueue(
+        EmailMessage('Тема', 'Текст', 'blog@example.com', [to]))
+
+
+def test_password_reset_is_queued(client, mixer):
+    user = mixer.blend('auth.User', email='user@example.com')
+    response = client.post('/auth/password_reset/', {'email': user.email})
+    assert response.status_code == 302
+    assert not mail.outbox, (
+        'Убедитесь, что письмо для сброса пароля не отправляется в запросе.'
+    )
+    message = OutboxMessage.objects.get()
+    assert message.to == user.email
+    call_command('send_outbox', stdout=StringIO())
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == [user.email]
+    assert '/auth/reset/' in mail.outbox[0].body
+    message.refresh_from_db()
+    assert message.sent_at is not None
+
+
+def test_send_outbox_sends_in_batches():
+    for number in range(5):
+        enqueue(f'user{number}@example.com')
+    output = StringIO()
+    call_command('send_outbox', batch_size=2, stdout=output)
+    assert len(mail.outbox) == 5
+    assert 'Отправлено: 5' in output.getvalue()
+    assert not OutboxMessage.objects.filter(sent_at__isnull=True).exists()
+
+
+def test_failed_messages_are_retried_later():
+    enqueue('ok@example.com')
+    broken = enqueue('broken@example.com')
+    sent, failed = outbox.deliver(outbox.claim(), FlakyBackend())
+    assert (sent, failed) == (1, 1)
+    broken.refresh_from_db()
+    assert broken.sent_at is None
+    assert broken.attempts == 1
+    assert broken.send_after > timezone.now(), (
+        'Убедитесь, что неотправленное письмо откладывается на потом.'
+    )
+    assert 'SMTPRecipientsRefused' in broken.last_error
+    assert outbox.claim() == []
+
+
+def test_failed_reconnect_defers_rest_of_batch():
+    enqueue('broken@example.com')
+    for number in range(2):
+        enqueue(f'user{number}@example.com')
+    sent, failed = outbox.deliver(outbox.claim(), ReconnectFailsBackend())
+    assert (sent, failed) == (0, 3)
+    assert not mail.outbox
+    for record in OutboxMessage.objects.all():
+        assert record.attempts == 1, (
+            'Убедитесь, что при недоступном сервере оставшиеся письма '
+            'откладываются с учётом попытки.'
+        )
+        assert record.send_after > timezone.now()
+    assert 'ConnectionRefusedError' in OutboxMessage.objects.get(
+        to='user0@example.com').last_error
+
+
+@override_settings(EMAIL_BACKEND='test_outbox.DownBackend')
+def test_send_outbox_survives_unreachable_server():
+    enqueue('user@example.com')
+    output = StringIO()
+    call_command('send_outbox', stdout=output)
+    assert 'ошибок: 1' in output.getvalue()
+    assert OutboxMessage.objects.get().attempts == 1
+
+
+def test_claimed_messages_are_not_claimed_twice():
+    enqueue('user@example.com')
+    assert len(outbox.claim()) == 1
+    assert outbox.claim() == [], (
+        'Убедитесь, что письмо не достаётся двум обработчикам сразу.'
+    )
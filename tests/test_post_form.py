@@ -0,0 +1,59 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from blog.widgets import CHOICES_LIMIT
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_options(content, name):
+    select = re.search(
+        rf'<select name="{name}".*?</select>', content, re.DOTALL)
+    assert select, f'На странице нет поля `{name}`.'
+    return re.findall(r'<option value="(\d*)"( selected)?', select.group())
+
+
+def test_post_form_renders_bounded_choices(user_client, mixer):
+    mixer.cycle(CHOICES_LIMIT * 2).blend('blog.Location', is_published=True)
+    response = user_client.get('/posts/create/')
+    content = response.content.decode()
+    assert len(get_options(content, 'location')) == CHOICES_LIMIT + 1, (
+        'Убедитесь, что форма публикации не выводит все местоположения.'
+    )
+    assert 'data-autocomplete-url="/autocomplete/locations/"' in content
+
+
+def test_post_form_keeps_selected_choice(user_client, user, mixer):
+    mixer.cycle(CHOICES_LIMIT).blend(
+        'blog.Location', is_published=True, name='А')
+    hidden = mixer.blend('blog.Location', is_published=False, name='Я')
+    category = mixer.blend('blog.Category', is_published=True)
+    post = mixer.blend('blog.Post', author=user, location=hidden,
+                       category=category)
+    response = user_client.get(f'/posts/{post.id}/edit/')
+    options = get_options(response.content.decode(), 'location')
+    assert (str(hidden.id), ' selected') in options, (
+        'Убедитесь, что форма редактирования показывает выбранное '
+        'местоположение, даже если его нет среди первых вариантов.'
+    )
+
+
+def test_post_form_accepts_choice_outside_rendered(user_client, mixer):
+    mixer.cycle(CHOICES_LIMIT).blend(
+        'blog.Location', is_published=True, name='А')
+    location = mixer.blend('blog.Location', is_published=True, name='Я')
+    category = mixer.blend('blog.Category', is_published=True)
+    response = user_client.post('/posts/create/', {
+        'title': 'Заголовок',
+        'text': 'Текст',
+        'pub_date': (timezone.now() - timedelta(days=1)).date(),
+        'is_published': True,
+        'location': location.id,
+        'category': category.id,
+    })
+    assert response.status_code == 302, (
+        'Убедитесь, что форма принимает любое существующее местоположение.'
+    )
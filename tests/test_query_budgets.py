@@ -0,0 +1,128 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from blog import autocomplete, catalog, urls as blog_urls, users
+from conftest import N_PER_FIXTURE, N_PER_PAGE
+from pages import urls as pages_urls
+
+pytestmark = [pytest.mark.django_db]
+
+SMALL_DATASET = N_PER_FIXTURE
+LARGE_DATASET = N_PER_PAGE * 2
+
+# Counted with cold caches. Warm feed pages need a single query for
+# comment counts, see test_feeds.py.
+QUERY_BUDGETS = {
+    'blog:index': 6,
+    'blog:profile': 6,
+    'blog:edit_profile': 2,
+    'blog:change_password': 2,
+    'blog:post_detail': 5,
+    'blog:create_post': 4,
+    'blog:edit_post': 7,
+    'blog:delete_post': 5,
+    'blog:category_posts': 7,
+    'blog:add_comment': 2,
+    'blog:edit_comment': 4,
+    'blog:delete_comment': 4,
+    'blog:search': 4,
+    'blog:autocomplete_users': 3,
+    'blog:autocomplete_categories': 3,
+    'blog:autocomplete_locations': 3,
+    'blog:concurrency_metrics': 1,
+    'pages:about': 2,
+    'pages:rules': 2,
+}
+
+
+def get_routes():
+    for module in (blog_urls, pages_urls):
+        for pattern in module.urlpatterns:
+            if isinstance(pattern, URLPattern):
+                yield f'{module.app_name}:{pattern.name}', pattern
+
+
+ROUTES = dict(get_routes())
+
+
+def make_dataset(mixer, size):
+    author = mixer.blend('auth.User')
+    category = mixer.blend('blog.Category', is_published=True)
+    location = mixer.blend('blog.Location', is_published=True)
+    posts = mixer.cycle(size).blend(
+        'blog.Post',
+        author=author,
+        category=category,
+        location=location,
+        is_published=True,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    post = posts[0]
+    comments = mixer.cycle(size).blend(
+        'blog.Comment', post=post, author=mixer.SELECT
+    )
+    mixer.cycle(size).blend(
+        'blog.Comment', post=mixer.sequence(*posts), author=author
+    )
+    values = {
+        'username': author.username,
+        'post_id': post.id,
+        'comment_id': comments[0].id,
+        'category_slug': category.slug,
+    }
+    comments[0].author = author
+    comments[0].save()
+    return author, values
+
+
+def count_queries(route_name, author, values):
+    pattern = ROUTES[route_name]
+    kwargs = {key: values[key] for key in pattern.pattern.converters}
+    url = reverse(route_name, kwargs=kwargs)
+    client = Client()
+    client.force_login(author)
+    # Measure with cold in-process caches, so both datasets pay the same.
+    autocomplete.clear()
+    catalog.clear()
+    users.clear()
+    cache.clear()
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code in (HTTPStatus.OK, HTTPStatus.FOUND), (
+        f'Страница `{url}` вернула статус {response.status_code}.'
+    )
+    return len(queries), [query['sql'] for query in queries]
+
+
+def test_every_route_has_budget():
+    missing = set(ROUTES) - set(QUERY_BUDGETS)
+    assert not missing, (
+        f'Укажите бюджет запросов к БД в QUERY_BUDGETS для: {missing}.'
+    )
+
+
+@pytest.mark.parametrize('route_name', sorted(ROUTES))
+def test_query_count_does_not_grow(mixer, route_name):
+    small, small_sql = count_queries(
+        route_name, *make_dataset(mixer, SMALL_DATASET)
+    )
+    large, large_sql = count_queries(
+        route_name, *make_dataset(mixer, LARGE_DATASET)
+    )
+    assert small == large, (
+        f'Число запросов на `{route_name}` растёт вместе с данными: '
+        f'{small} -> {large}. Запросы:\n' + '\n'.join(large_sql)
+    )
+    budget = QUERY_BUDGETS.get(route_name)
+    assert budget is not None and large <= budget, (
+        f'Страница `{route_name}` выполняет {large} запросов при бюджете '
+        f'{budget}. Запросы:\n' + '\n'.join(large_sql)
+    )
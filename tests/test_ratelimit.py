@@ -0,0 +1,99 @@
+import threading
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog import ratelimit
+from blog.cache import AtomicFileBasedCache
+
+RATE_LIMITS = {
+    'comments': {'capacity': 2, 'period': 60},
+    'posts': {'capacity': 2, 'period': 60},
+    'registration': {'capacity': 1, 'period': 60},
+}
+
+
+def test_bucket_refills_evenly():
+    hit = ratelimit.hit_shared
+    assert hit('bucket', 1000, 2000, now=0) == 0
+    assert hit('bucket', 1000, 2000, now=0) == 0
+    assert hit('bucket', 1000, 2000, now=0) == 1000
+    assert hit('bucket', 1000, 2000, now=500) == 500
+    assert hit('bucket', 1000, 2000, now=1000) == 0
+    assert hit('bucket', 1000, 2000, now=1000) == 1000
+    assert hit('bucket', 1000, 2000, now=10_000) == 0
+
+
+def test_file_cache_incr_is_atomic(tmp_path):
+    cache = AtomicFileBasedCache(str(tmp_path), {})
+    with pytest.raises(ValueError):
+        cache.incr('bucket')
+    cache.set('bucket', 0, 60)
+
+    def count():
+        # Each thread opens the files on its own, like another worker.
+        worker = AtomicFileBasedCache(str(tmp_path), {})
+        for _ in range(50):
+            worker.incr('bucket')
+
+    threads = [threading.Thread(target=count) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.get('bucket') == 400, (
+        'Убедитесь, что incr() файлового кеша не теряет обновления.'
+    )
+    cache.set('expired', 1, -1)
+    with pytest.raises(ValueError):
+        cache.incr('expired')
+
+
+@pytest.mark.django_db
+@override_settings(RATE_LIMITS=RATE_LIMITS)
+def test_comments_over_limit_get_429(user_client,
+                                     post_with_published_location):
+    post = post_with_published_location
+    url = f'/posts/{post.id}/comment/'
+    for _ in range(2):
+        assert user_client.post(url, {'text': 'Текст'}).status_code == 302
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.post(url, {'text': 'Текст'})
+    assert response.status_code == 429
+    assert int(response['Retry-After']) > 0
+    assert not [query for query in queries
+                if 'django_session' not in query['sql']], (
+        'Убедитесь, что отклонённый запрос не обращается к базе данных.'
+    )
+    assert post.comment.count() == 2
+    assert user_client.get(f'/posts/{post.id}/').status_code == 200
+
+
+@pytest.mark.django_db
+@override_settings(RATE_LIMITS=RATE_LIMITS)
+def test_registration_is_limited_by_ip(client):
+    data = {'username': 'bot', 'password1': 'Sup3r-secret-1',
+            'password2': 'Sup3r-secret-1'}
+    assert client.post('/auth/registration/', data).status_code == 302
+    data['username'] = 'bot2'
+    assert client.post('/auth/registration/', data).status_code == 429
+    response = client.post('/auth/registration/', data,
+                           REMOTE_ADDR='10.0.0.2')
+    assert response.status_code == 302
+
+
+@override_settings(RATE_LIMITS=RATE_LIMITS)
+def test_local_buckets_when_cache_is_down(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise ConnectionError('cache is down')
+
+    monkeypatch.setattr(cache, 'incr', unavailable)
+    ratelimit.LOCAL.clear()
+    assert ratelimit.hit('posts', 'ip:10.0.0.1') == 0
+    assert ratelimit.hit('posts', 'ip:10.0.0.1') == 0
+    assert ratelimit.hit('posts', 'ip:10.0.0.1') > 0, (
+        'Убедитесь, что без кеша работают корзины в памяти процесса.'
+    )
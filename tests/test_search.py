@@ -0,0 +1,91 @@
+from datetime import timedelta
+from functools import partial
+from io import StringIO
+
+import pytest
+from django.core import serializers
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.search import SQLITE_TABLE
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def blend_post(blend_post, published_location):
+    return partial(blend_post, location=published_location,
+                   text='Обычный день')
+
+
+def search_ids(client, query, after=None):
+    params = {'q': query}
+    if after:
+        params['after'] = after
+    response = client.get('/search/', params)
+    assert response.status_code == 200
+    return ([post.id for post in response.context['object_list']],
+            response.context['next_cursor'])
+
+
+def test_search_respects_visibility(client, blend_post):
+    visible = blend_post(title='Поездка к морю')
+    blend_post(title='Черновик про море', is_published=False)
+    blend_post(title='Будущее море', pub_date=timezone.now() + timedelta(1))
+    blend_post(title='Про лес')
+    assert search_ids(client, 'море')[0] == [visible.id], (
+        'Убедитесь, что поиск возвращает только опубликованные посты.'
+    )
+
+
+def test_search_ranks_title_and_paginates(client, blend_post):
+    in_text = [blend_post(title=f'Пост {i}', text='Шли на поезде')
+               for i in range(8)]
+    in_title = [blend_post(title=f'Поезд {i}') for i in range(4)]
+    assert search_ids(client, 'поезд лес')[0] == [], (
+        'Убедитесь, что найдены только посты со всеми словами запроса.'
+    )
+    first, cursor = search_ids(client, 'поезд')
+    assert first[:4] == sorted(post.id for post in in_title)
+    assert len(first) == 10 and cursor
+    second, cursor = search_ids(client, 'поезд', after=cursor)
+    assert cursor is None
+    assert set(first) | set(second) == {
+        post.id for post in in_text + in_title
+    }
+    assert not set(first) & set(second)
+
+
+def test_search_index_follows_changes(client, blend_post):
+    post = blend_post(title='Снег')
+    assert search_ids(client, 'снег')[0] == [post.id]
+    post.title = 'Солнце'
+    post.save()
+    assert search_ids(client, 'снег')[0] == []
+    assert search_ids(client, 'солнце')[0] == [post.id]
+    post.delete()
+    assert search_ids(client, 'солнце')[0] == []
+
+
+def test_loaddata_fills_search_index(client, blend_post, tmp_path):
+    post = blend_post(title='Вокзал')
+    fixture = tmp_path / 'posts.json'
+    fixture.write_text(serializers.serialize('json', [post]),
+                       encoding='utf-8')
+    pk = post.pk
+    post.delete()
+    call_command('loaddata', str(fixture), stdout=StringIO())
+    assert search_ids(client, 'вокзал')[0] == [pk], (
+        'Убедитесь, что посты, загруженные через loaddata, попадают в '
+        'поисковый индекс.'
+    )
+
+
+def test_rebuild_search_index(client, blend_post):
+    post = blend_post(title='Театр')
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_TABLE}')
+    assert search_ids(client, 'театр')[0] == []
+    call_command('rebuild_search_index', stdout=StringIO())
+    assert search_ids(client, 'театр')[0] == [post.id]
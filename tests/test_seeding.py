@@ -0,0 +1,54 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Comment, Post, User
+from blog.seeding import seed
+
+pytestmark = [pytest.mark.django_db]
+
+
+class Rollback(Exception):
+    pass
+
+
+def seeded_snapshot(**kwargs):
+    try:
+        with transaction.atomic():
+            seed(**kwargs)
+            snapshot = list(Post.objects.order_by('pk').values_list(
+                'pk', 'title', 'author_id', 'category_id', 'is_published'))
+            raise Rollback
+    except Rollback:
+        return snapshot
+
+
+def test_seed_is_deterministic():
+    options = {'users': 5, 'posts': 50, 'comments': 100}
+    assert seeded_snapshot(seed=1, **options) == seeded_snapshot(
+        seed=1, **options
+    ), 'Убедитесь, что одинаковый seed даёт одинаковые данные.'
+    assert seeded_snapshot(seed=1, **options) != seeded_snapshot(
+        seed=2, **options
+    )
+
+
+def test_seed_blog_command():
+    call_command('seed_blog', users=10, categories=3, locations=5,
+                 posts=500, comments=1000, unpublished=0.1, future=0.1,
+                 batch_size=128, stdout=StringIO())
+    assert Post.objects.count() == 500
+    assert Comment.objects.count() == 1000
+    assert Post.objects.filter(is_published=False).exists()
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists()
+    last_pk = Post.objects.order_by('pk').last().pk
+    post = Post.objects.create(
+        title='Новый', text='Текст', pub_date=timezone.now(),
+        author=User.objects.first(),
+    )
+    assert post.pk == last_pk + 1, (
+        'Убедитесь, что после заполнения последовательности id сброшены.'
+    )
@@ -0,0 +1,57 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def session_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert response.context['user'].is_authenticated
+    return [query for query in queries if 'django_session' in query['sql']]
+
+
+def test_cached_sessions_skip_database(user_client, user):
+    assert not session_queries(user_client, f'/profile/{user.username}/'), (
+        'Убедитесь, что сессии читаются из кеша, а не из БД.'
+    )
+
+
+def test_session_cache_caps_timeout():
+    cache = caches['sessions']
+    cache.set('key', 'value', 14 * 24 * 3600)
+    expires = cache._expire_info[cache.make_key('key')]
+    assert expires <= timezone.now().timestamp() + cache.default_timeout
+
+
+@override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+def test_signed_cookie_sessions(user):
+    client = Client()
+    client.force_login(user)
+    assert not session_queries(client, f'/profile/{user.username}/')
+    assert not Session.objects.exists()
+
+
+def test_purge_sessions_keeps_live_sessions():
+    now = timezone.now()
+    for number in range(5):
+        Session.objects.create(session_key=f'expired{number}',
+                               session_data='',
+                               expire_date=now - timedelta(days=1))
+    Session.objects.create(session_key='live', session_data='',
+                           expire_date=now + timedelta(days=1))
+    output = StringIO()
+    call_command('purge_sessions', batch_size=2, stdout=output)
+    assert 'Удалено сессий: 5' in output.getvalue()
+    assert list(Session.objects.values_list('pk', flat=True)) == ['live']
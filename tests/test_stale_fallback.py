@@ -0,0 +1,84 @@
+import pytest
+from django.core.cache import caches
+from django.db import OperationalError, connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.middleware import STALE_WARNING, CircuitBreaker
+
+pytestmark = [pytest.mark.django_db]
+
+
+def broken_database(execute, sql, params, many, context):
+    raise OperationalError('database is locked')
+
+
+def test_database_error_serves_stale_page(published_post):
+    client = Client(raise_request_exception=False)
+    fresh = client.get('/')
+    assert fresh.status_code == 200
+    assert 'Warning' not in fresh
+    with connection.execute_wrapper(broken_database):
+        response = client.get('/')
+    assert response.status_code == 200, (
+        'Убедитесь, что при ошибке базы данных анонимный посетитель получает '
+        'сохранённую копию страницы.'
+    )
+    assert response['Warning'] == STALE_WARNING
+    assert response.content == fresh.content
+
+
+def test_stale_copies_skip_local_tier(published_post):
+    Client().get('/')
+    cache = caches['default']
+    assert [key for key in cache.shared._cache if 'stale:' in key]
+    assert not [key for key in cache.local.data if 'stale:' in key], (
+        'Убедитесь, что копии страниц не вытесняют горячие записи из '
+        'памяти процесса.'
+    )
+
+
+def test_slow_query_serves_stale_page(published_post):
+    client = Client(raise_request_exception=False)
+    client.get('/')
+    with override_settings(DB_LATENCY_BUDGET=-1):
+        response = client.get('/')
+    assert response['Warning'] == STALE_WARNING
+
+
+@override_settings(DB_BREAKER_FAILURES=2)
+def test_open_breaker_keeps_requests_off_database(published_post, user):
+    client = Client(raise_request_exception=False)
+    client.get('/')
+    with connection.execute_wrapper(broken_database):
+        client.get('/')
+        client.get('/')
+    user_client = Client(raise_request_exception=False)
+    user_client.handler = client.handler
+    user_client.force_login(user)
+    with CaptureQueriesContext(connection) as queries:
+        stale = client.get('/')
+        response = user_client.get('/')
+    assert stale['Warning'] == STALE_WARNING
+    assert response.status_code == 503
+    assert int(response['Retry-After']) > 0
+    assert not queries, (
+        'Убедитесь, что при открытом предохранителе запросы не идут в базу.'
+    )
+
+
+def test_breaker_reopens_after_single_failure_in_half_open_state():
+    breaker = CircuitBreaker(failures=2, cooldown=60)
+    breaker.record_failure()
+    assert not breaker.is_open()
+    breaker.record_failure()
+    assert breaker.is_open()
+    breaker.opened_until = 0
+    breaker.record_failure()
+    assert breaker.is_open(), (
+        'Убедитесь, что после паузы одна ошибка снова размыкает цепь.'
+    )
+    breaker.opened_until = 0
+    breaker.record_success()
+    breaker.record_failure()
+    assert not breaker.is_open()
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog import feeds
+from blog.cache import AtomicFileBasedCache
+
+
+@pytest.fixture(params=['locmem', 'file'])
+def shared_cache(request, monkeypatch, tmp_path):
+    if request.param == 'file':
+        monkeypatch.setattr(feeds, 'cache',
+                            AtomicFileBasedCache(str(tmp_path), {}))
+    return feeds.cache
+
+
+def test_concurrent_misses_compute_once(shared_cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'value', None
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(
+            feeds.fetch('hot', ('v1',), compute)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ['value'] * 8
+    assert len(calls) == 1, (
+        'Убедитесь, что пересчитывает значение только один поток.'
+    )
+
+
+def test_stale_value_is_served_while_locked(shared_cache):
+    feeds.fetch('hot', ('v1',), lambda: ('old', None))
+    assert shared_cache.add('lock:hot', 1, feeds.LOCK_TIMEOUT)
+    value = feeds.fetch('hot', ('v2',), lambda: pytest.fail('пересчёт'))
+    assert value == 'old'
+    shared_cache.delete('lock:hot')
+    assert feeds.fetch('hot', ('v2',), lambda: ('new', None)) == 'new'
+
+
+def test_refresh_early_near_expiry():
+    now = timezone.now()
+    envelope = {'delta': 0.1, 'expires': now.timestamp() + 3600}
+    assert not feeds.refresh_early(envelope, now)
+    envelope['expires'] = now.timestamp()
+    assert feeds.refresh_early(envelope, now)
+
+
+def test_file_cache_add_is_exclusive(tmp_path):
+    cache = AtomicFileBasedCache(str(tmp_path), {})
+    assert cache.add('lock', 1, 60)
+    assert not cache.add('lock', 2, 60)
+    assert cache.get('lock') == 1
+    cache.set('expired', 1, -1)
+    assert cache.add('expired', 2, 60)
+    assert cache.get('expired') == 2
+
+
+def test_file_cache_never_culls_pinned_keys(tmp_path):
+    cache = AtomicFileBasedCache(str(tmp_path), {'OPTIONS': {
+        'MAX_ENTRIES': 10, 'CULL_FREQUENCY': 2,
+        'PINNED_PREFIXES': ['lock:', 'feed:version:'],
+    }})
+    assert cache.add('lock:page', 1, 60)
+    cache.set('feed:version:posts', 'v1', None)
+    cache.set('lock:expired', 1, -1)
+    for number in range(50):
+        cache.set(f'page:{number}', number)
+    assert len([number for number in range(50)
+                if cache.get(f'page:{number}') is not None]) <= 10
+    assert cache.get('lock:page') == 1, (
+        'Убедитесь, что очистка файлового кеша не удаляет блокировки.'
+    )
+    assert cache.get('feed:version:posts') == 'v1'
+    assert len(cache._list_pinned_files()) == 2
+    cache.clear()
+    assert cache.get('lock:page') is None
+
+
+@override_settings(FEED_CACHE_TIMEOUT=-1)
+def test_expired_version_stamps_are_collected(monkeypatch, tmp_path):
+    cache = AtomicFileBasedCache(str(tmp_path), {'OPTIONS': {
+        'MAX_ENTRIES': 2, 'PINNED_PREFIXES': ['feed:version:'],
+    }})
+    monkeypatch.setattr(feeds, 'cache', cache)
+    feeds.get_versions(('author:1', 'post:1'))
+    feeds.bump('posts')
+    assert len(cache._list_pinned_files()) == 3
+    for number in range(3):
+        cache.set(f'page:{number}', number)
+    assert not cache._list_pinned_files(), (
+        'Убедитесь, что устаревшие версии лент удаляются из кеша.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_is_cached(user_client, mixer, published_post):
+    post = published_post
+    url = f'/posts/{post.id}/'
+    user_client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        response = user_client.get(url)
+    assert response.status_code == 200
+    assert not [query for query in queries
+                if 'blog_post' in query['sql']
+                or 'blog_comment' in query['sql']], (
+        'Убедитесь, что повторный запрос страницы публикации берёт её из кеша.'
+    )
+    mixer.blend('blog.Comment', post=post, text='Свежий комментарий')
+    assert 'Свежий комментарий' in user_client.get(url).content.decode()
@@ -0,0 +1,32 @@
+import pytest
+from django.template.loader import render_to_string
+
+from blog.models import Post
+from blog.strict_templates import LazyRelationError
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_lazy_relation_in_template_raises(post_with_published_location):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    with pytest.raises(LazyRelationError) as exc_info:
+        render_to_string('includes/post_card.html', {'post': post})
+    message = str(exc_info.value)
+    assert 'includes/post_card.html' in message, (
+        'Убедитесь, что в сообщении об ошибке указан шаблон.'
+    )
+    assert 'строка' in message
+
+
+def test_select_related_renders(post_with_published_location):
+    post = Post.objects.select_related(
+        'author', 'category', 'location'
+    ).get(pk=post_with_published_location.pk)
+    assert post.title in render_to_string(
+        'includes/post_card.html', {'post': post}
+    )
+
+
+def test_lazy_relation_outside_template_allowed(post_with_published_location):
+    post = Post.objects.get(pk=post_with_published_location.pk)
+    assert post.author.username
@@ -0,0 +1,50 @@
+from django.core.cache import caches
+
+from blog import feeds
+
+
+def test_local_tier_serves_hot_entries():
+    cache, shared = caches['default'], caches['shared']
+    cache.set('page', ['post'])
+    shared.delete('page')
+    assert cache.get('page') == ['post'], (
+        'Убедитесь, что повторное чтение берёт значение из памяти процесса.'
+    )
+    cache.get('page').append('other')
+    assert cache.get('page') == ['post']
+    cache.clear_local()
+    assert cache.get('page') is None
+
+
+def test_version_stamps_skip_local_tier():
+    cache, shared = caches['default'], caches['shared']
+    cache.set('feed:version:posts', 'old')
+    shared.set('feed:version:posts', 'new')
+    assert cache.get('feed:version:posts') == 'new'
+    assert cache.get_many(['feed:version:posts']) == {
+        'feed:version:posts': 'new'}
+
+
+def test_write_on_another_worker_invalidates_local_copy():
+    shared = caches['shared']
+    versions = feeds.get_versions(('posts',))
+    assert feeds.fetch('feed:index', versions, lambda: ('old', None)) == 'old'
+    # Another worker publishes a post and recomputes the page.
+    feeds.bump('posts')
+    versions = feeds.get_versions(('posts',))
+    envelope = shared.get('feed:index')
+    shared.set('feed:index', {**envelope, 'versions': versions,
+                              'value': 'new'})
+    value = feeds.fetch('feed:index', versions, lambda: ('recomputed', None))
+    assert value == 'new', (
+        'Убедитесь, что устаревшая локальная копия заменяется значением из '
+        'общего кеша без пересчёта.'
+    )
+
+
+def test_add_is_shared():
+    cache = caches['default']
+    assert cache.add('lock:page', 1, 10)
+    assert not cache.add('lock:page', 2, 10)
+    cache.delete('lock:page')
+    assert caches['shared'].get('lock:page') is None
@@ -0,0 +1,56 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from blog import users
+
+pytestmark = [pytest.mark.django_db]
+
+
+def user_queries(client, url, expected_status=200):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert response.status_code == expected_status
+    return [query for query in queries if 'FROM "auth_user"' in query['sql']]
+
+
+def test_request_user_is_cached(user_client, user):
+    user_queries(user_client, '/')
+    assert not user_queries(user_client, '/'), (
+        'Убедитесь, что пользователь запроса берётся из кеша.'
+    )
+
+
+def test_profile_lookup_is_cached(client, user):
+    url = f'/profile/{user.username}/'
+    user_queries(client, url)
+    assert not user_queries(client, url), (
+        'Убедитесь, что страница профиля находит пользователя через кеш.'
+    )
+    user_queries(client, '/profile/nobody/', 404)
+    assert not user_queries(client, '/profile/nobody/', 404)
+
+
+def test_user_cache_is_invalidated(client, user):
+    old_url = f'/profile/{user.username}/'
+    user_queries(client, old_url)
+    user.username = 'renamed'
+    user.save()
+    user_queries(client, old_url, 404)
+    user_queries(client, '/profile/renamed/')
+
+
+def test_password_change_ends_cached_session(user_client, user):
+    response = user_client.get('/')
+    assert response.context['user'].is_authenticated
+    user.set_password('new-password')
+    user.save()
+    response = user_client.get('/')
+    assert not response.context['user'].is_authenticated, (
+        'Убедитесь, что смена пароля сбрасывает пользователя в кеше.'
+    )
+
+
+def test_user_cache_returns_copies(user):
+    users.get_user('pk', user.pk).first_name = 'Изменено'
+    assert users.get_user('pk', user.pk).first_name == user.first_name
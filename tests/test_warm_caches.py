@@ -0,0 +1,36 @@
+import importlib
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(url).status_code == 200
+    return len(queries)
+
+
+def test_warm_caches_fills_feeds(client, published_post, user):
+    output = StringIO()
+    call_command('warm_caches', pages=1, stdout=output)
+    for step in ('index', 'categories', 'profiles'):
+        assert step in output.getvalue(), (
+            f'Убедитесь, что команда сообщает время шага `{step}`.'
+        )
+    for url in ('/', f'/category/{published_post.category.slug}/',
+                f'/profile/{user.username}/'):
+        assert count_queries(client, url) == 1, (
+            f'Убедитесь, что после прогрева `{url}` отдаётся из кеша.'
+        )
+
+
+def test_wsgi_hook_warms_caches(monkeypatch, client, published_post):
+    monkeypatch.setenv('BLOGICUM_WARM_CACHES', '1')
+    from blogicum import wsgi
+    importlib.reload(wsgi)
+    assert count_queries(client, '/') == 1